@@ -72,6 +72,7 @@ import re
 import six
 import types
 import unittest
+import weakref
 
 import stubout
 
@@ -136,15 +137,23 @@ class UnexpectedMethodCallError(Error):
         if expected is None:
             self._str = "Unexpected method call %s" % (unexpected_method,)
         else:
+            # Snapshot both sides now, since a group's pending calls change
+            # later, but only diff them if the message is actually shown;
+            # most of these errors are caught by the code under test or by
+            # assertRaises.
+            self._str = None
+            self._unexpected_lines = str(unexpected_method).splitlines(True)
+            self._expected_lines = str(expected).splitlines(True)
+
+    def __str__(self):
+        if self._str is None:
             differ = difflib.Differ()
-            diff = differ.compare(str(unexpected_method).splitlines(True),
-                                  str(expected).splitlines(True))
+            diff = differ.compare(self._unexpected_lines,
+                                  self._expected_lines)
             self._str = (
                 "Unexpected method call.  unexpected:-  expected:+\n%s"
                 % ("\n".join(line.rstrip() for line in diff),)
             )
-
-    def __str__(self):
         return self._str
 
 
@@ -359,12 +368,31 @@ class Mox(object):
         """
 
         attr_to_replace = getattr(obj, attr_name)
-        attr_type = type(attr_to_replace)
+        self._CheckNotMocked(attr_to_replace)
+        self._StubOutWithMock(obj, attr_name, attr_to_replace,
+                              use_mock_anything)
 
+    def _CheckNotMocked(self, attr_to_replace):
+        """Raise TypeError if an attribute about to be stubbed is a mock."""
+
+        attr_type = type(attr_to_replace)
         if attr_type == MockAnything or attr_type == MockObject:
             raise TypeError('Cannot mock a MockAnything! Did you remember to '
                             'call UnsetStubs in your previous test?')
 
+    def _StubOutWithMock(self, obj, attr_name, attr_to_replace,
+                         use_mock_anything):
+        """Replace obj.attr_name, already looked up and checked, with a Mock.
+
+        Args:
+          obj: A Python object (class, module, instance, callable).
+          attr_name: str.  The name of the attribute to replace with a mock.
+          attr_to_replace: The current value of obj.attr_name.
+          use_mock_anything: bool. True if a MockAnything should be used
+            regardless of the type of attribute.
+        """
+
+        attr_type = type(attr_to_replace)
         if (attr_type in self._USE_MOCK_OBJECT or
                 # isinstance(attr_type, tuple(self._USE_MOCK_OBJECT)) or
                 isinstance(attr_to_replace, object) or
@@ -378,6 +406,39 @@ class Mox(object):
 
         self.stubs.Set(obj, attr_name, stub)
 
+    def StubOutWithMocks(self, obj, attr_names, use_mock_anything=False):
+        """Replace several attributes of the same object with Mocks.
+
+        This is StubOutWithMock applied to each name in turn, except that
+        every attribute is looked up and checked before any of them is
+        replaced, so a missing, repeated or already mocked name leaves obj
+        untouched.  If creating one of the mocks fails, the attributes
+        replaced before it stay stubbed until UnsetStubs is called.
+
+        Args:
+          obj: A Python object (class, module, instance, callable).
+          attr_names: iterable of str.  The names of the attributes to replace.
+          use_mock_anything: bool. True if MockAnything should be used
+            regardless of the type of attribute.
+
+        Raises:
+          ValueError: if a name appears more than once.
+          TypeError: if an attribute is already a mock.
+        """
+
+        attr_names = list(attr_names)
+        if len(set(attr_names)) != len(attr_names):
+            raise ValueError('Cannot stub out the same attribute twice: %r'
+                             % (attr_names,))
+        attrs_to_replace = [getattr(obj, attr_name)
+                            for attr_name in attr_names]
+        for attr_to_replace in attrs_to_replace:
+            self._CheckNotMocked(attr_to_replace)
+
+        for attr_name, attr_to_replace in zip(attr_names, attrs_to_replace):
+            self._StubOutWithMock(obj, attr_name, attr_to_replace,
+                                  use_mock_anything)
+
     def StubOutClassWithMocks(self, obj, attr_name):
         """Replace a class with a "mock factory" that will create mock objects.
 
@@ -417,11 +478,7 @@ class Mox(object):
         mox.VerifyAll()
         """
         attr_to_replace = getattr(obj, attr_name)
-        attr_type = type(attr_to_replace)
-
-        if attr_type == MockAnything or attr_type == MockObject:
-            raise TypeError('Cannot mock a MockAnything! Did you remember to '
-                            'call UnsetStubs in your previous test?')
+        self._CheckNotMocked(attr_to_replace)
 
         if not inspect.isclass(attr_to_replace):
             raise TypeError('Given attr is not a Class.  Use StubOutWithMock.')
@@ -433,7 +490,11 @@ class Mox(object):
     def UnsetStubs(self):
         """Restore stubs to their original state."""
 
-        self.stubs.UnsetAll()
+        # The stub cache doubles as the dirty flag: when it is empty there
+        # is nothing to restore. It also covers stubs set directly through
+        # self.stubs, which a separate flag would miss.
+        if self.stubs.cache:
+            self.stubs.UnsetAll()
 
 
 def Replay(*args):
@@ -556,6 +617,8 @@ class MockAnything:
     def __eq__(self, rhs):
         """Provide custom logic to compare objects."""
 
+        if self is rhs:
+            return True
         return (isinstance(rhs, MockAnything) and
                 self._replay_mode == rhs._replay_mode and
                 self._expected_calls_queue == rhs._expected_calls_queue)
@@ -637,9 +700,6 @@ class MockObject(MockAnything, object):
         # which is not a proper object (it can be anything. :-)
         MockAnything.__dict__['__init__'](self)
 
-        # Get a list of all the public and special methods we should mock.
-        self._known_methods = set()
-        self._known_vars = set()
         self._class_to_mock = class_to_mock
         try:
             if inspect.isclass(self._class_to_mock):
@@ -676,16 +736,21 @@ class MockObject(MockAnything, object):
             except Exception:
                 pass
 
+        # Get a list of all the public and special methods we should mock.
+        known_methods = set()
+        known_vars = set()
         for method in dir(class_to_mock):
             try:
                 attr = getattr(class_to_mock, method)
             except AttributeError:
                 continue
             if callable(attr):
-                self._known_methods.add(method)
+                known_methods.add(method)
             elif not (isinstance(attr, property)):
                 # treating properties as class vars makes little sense.
-                self._known_vars.add(method)
+                known_vars.add(method)
+        self._known_methods = frozenset(known_methods)
+        self._known_vars = frozenset(known_vars)
 
         # Set additional attributes at instantiation time; this is quicker
         # than manually setting attributes that are normally created in
@@ -740,6 +805,8 @@ class MockObject(MockAnything, object):
     def __eq__(self, rhs):
         """Provide custom logic to compare objects."""
 
+        if self is rhs:
+            return True
         return (isinstance(rhs, MockObject) and
                 self._class_to_mock == rhs._class_to_mock and
                 self._replay_mode == rhs._replay_mode and
@@ -968,6 +1035,70 @@ class _MockObjectFactory(MockObject):
         super(_MockObjectFactory, self)._Verify()
 
 
+# Argument specifications of plain functions, keyed by the function.
+_ARGSPEC_CACHE = weakref.WeakKeyDictionary()
+
+
+def _GetArgSpec(method):
+    """Returns inspect.getargspec(method), cached for plain functions.
+
+    Bound and unbound methods share the entry of their underlying function,
+    so mocking the same method many times only inspects it once. Cached
+    entries hold the argument names as a tuple. Other callables are
+    inspected on every call.
+
+    Args:
+      # method: The callable to inspect.
+      method: callable
+
+    Raises:
+      TypeError: method could not be inspected.
+    """
+    if inspect.ismethod(method):
+        if six.PY2:
+            function = method.im_func
+        else:
+            function = method.__func__
+    else:
+        function = method
+    if not inspect.isfunction(function):
+        return inspect.getargspec(method)
+    try:
+        return _ARGSPEC_CACHE[function]
+    except KeyError:
+        argspec = inspect.getargspec(function)
+        # Every checker of this function shares the entry, so keep it
+        # immutable.
+        argspec = _ARGSPEC_CACHE[function] = argspec._replace(
+            args=tuple(argspec.args))
+        return argspec
+
+
+def _FixedArityMatcher(args):
+    """Returns a function telling whether a call fits args exactly.
+
+    The names left for keyword arguments after each possible number of
+    positional params are computed up front, so a check is a tuple index and
+    a set comparison.
+
+    Args:
+      # args: The argument names of a method without defaults, *args or
+      #   **kwargs.
+      args: [str]
+    """
+    remaining_names = tuple(frozenset(args[i:]) for i in range(len(args) + 1))
+    max_params = len(args)
+
+    def Matches(params, named_params):
+        if len(params) > max_params:
+            return False
+        names = remaining_names[len(params)]
+        return (len(named_params) == len(names) and
+                names.issuperset(named_params))
+
+    return Matches
+
+
 class MethodSignatureChecker(object):
     """Ensures that methods are called correctly."""
 
@@ -985,18 +1116,20 @@ class MethodSignatureChecker(object):
             Some methods and functions like built-ins can't be inspected.
         """
         try:
-            self._args, varargs, varkw, defaults = inspect.getargspec(method)
+            self._args, varargs, varkw, defaults = _GetArgSpec(method)
         except TypeError:
             raise ValueError('Could not get argument specification for %r'
                              % (method,))
         self._method = method
-        if inspect.ismethod(
-            self._method) or (
-            '.' in repr(
-                self._method)) or (
-                self._args and self._args[0] == 'self'):
+        # NOTE: '.' in repr(self._method) is very bad way to check if it's a
+        # bound method. Improve it as soon as possible.
+        self._is_method = (inspect.ismethod(self._method) or
+                           '.' in repr(self._method))
+        if self._is_method or (self._args and self._args[0] == 'self'):
             self._args = self._args[1:]  # Skip 'self'.
         self._instance = None  # May contain the instance this is bound to.
+        # The class a bound instance must belong to; resolved on first use.
+        self._expected_class = None
 
         self._has_varargs = varargs is not None
         self._has_varkw = varkw is not None
@@ -1006,6 +1139,11 @@ class MethodSignatureChecker(object):
         else:
             self._required_args = self._args[:-len(defaults)]
             self._default_args = self._args[-len(defaults):]
+        # Without defaults, *args or **kwargs only one shape of call fits.
+        if self._has_varargs or self._has_varkw or self._default_args:
+            self._fits_fixed_arity = None
+        else:
+            self._fits_fixed_arity = _FixedArityMatcher(self._args)
 
     def _RecordArgumentGiven(self, arg_name, arg_status):
         """Mark an argument as being given.
@@ -1024,6 +1162,46 @@ class MethodSignatureChecker(object):
             raise AttributeError('%s provided more than once' % (arg_name,))
         arg_status[arg_name] = MethodSignatureChecker._GIVEN
 
+    def _GetExpectedClass(self):
+        """Returns the class a bound instance of the checked method has.
+
+        The lookup walks the method's repr and members, so the result is
+        computed once and kept for later checks.
+        """
+        if self._expected_class is None:
+            expected = getattr(self._method, 'im_class', None)
+            if not expected:
+                search = re_search(
+                    '<(function|method) (?P<class>\w+)\.\w+ at \w+>',
+                    str(repr(self._method)))
+                if search:
+                    class_ = search.group('class')
+                    members = dict(inspect.getmembers(self._method))
+                    expected = members.get(
+                        class_, members.get('__globals__', {})
+                    ).get(class_, None)
+            if not expected:
+                search = re_search(
+                    '<(?P<method>((un)?bound method ))(?P<class>\w+)'
+                    '\.\w+ of <?(?P<module>\w+\.)(?P<class2>\w+) object '
+                    'at [A-Za-z0-9]+>?>',
+                    str(repr(self._method))
+                )
+
+                if search:
+                    for _, class_ in search.groupdict().items():
+                        members = dict(inspect.getmembers(self._method))
+                        expected = members.get(
+                            class_, members.get('__globals__', {})
+                        ).get(class_, None)
+                        if expected:
+                            break
+            if not expected and six.PY3:
+                expected = dict(
+                    inspect.getmembers(self._method))['__self__'].__class__
+            self._expected_class = expected
+        return self._expected_class
+
     def Check(self, params, named_params):
         """Ensures that the parameters used while recording a call are valid.
 
@@ -1037,11 +1215,6 @@ class MethodSignatureChecker(object):
           AttributeError: the given parameters don't work with the given
           method.
         """
-        arg_status = dict((a, MethodSignatureChecker._NEEDED)
-                          for a in self._required_args)
-        for arg in self._default_args:
-            arg_status[arg] = MethodSignatureChecker._DEFAULT
-
         # WARNING: Suspect hack ahead.
         #
         # Check to see if this is an unbound method, where the instance
@@ -1051,41 +1224,10 @@ class MethodSignatureChecker(object):
         #
         # NOTE: If a Func() comparator is used, and the signature is not
         # correct, this will cause extra executions of the function.
-        # NOTE: '.' in repr(self._method) is very bad way to check if it's a
-        # bound method. Improve it as soon as possible.
-        if inspect.ismethod(self._method) or '.' in repr(self._method):
+        if self._is_method:
             # The extra param accounts for the bound instance.
             if len(params) > len(self._required_args):
-                expected = getattr(self._method, 'im_class', None)
-                if not expected:
-                    search = re_search(
-                        '<(function|method) (?P<class>\w+)\.\w+ at \w+>',
-                        str(repr(self._method)))
-                    if search:
-                        class_ = search.group('class')
-                        members = dict(inspect.getmembers(self._method))
-                        expected = members.get(
-                            class_, members.get('__globals__', {})
-                        ).get(class_, None)
-                if not expected:
-                    search = re_search(
-                        '<(?P<method>((un)?bound method ))(?P<class>\w+)'
-                        '\.\w+ of <?(?P<module>\w+\.)(?P<class2>\w+) object '
-                        'at [A-Za-z0-9]+>?>',
-                        str(repr(self._method))
-                    )
-
-                    if search:
-                        for _, class_ in search.groupdict().items():
-                            members = dict(inspect.getmembers(self._method))
-                            expected = members.get(
-                                class_, members.get('__globals__', {})
-                            ).get(class_, None)
-                            if expected:
-                                break
-                if not expected and six.PY3:
-                    expected = dict(
-                        inspect.getmembers(self._method))['__self__'].__class__
+                expected = self._GetExpectedClass()
 
                 # Check if the param is an instance of the expected class,
                 # or check equality (useful for checking Comparators).
@@ -1108,6 +1250,18 @@ class MethodSignatureChecker(object):
                         params[0]._IsSubClass(expected)):
                     params = params[1:]
 
+        # Fast path: a fixed arity method is called correctly when the
+        # positional params are followed by exactly the remaining names.
+        # Anything else goes through the full check to report the error.
+        if (self._fits_fixed_arity is not None and
+                self._fits_fixed_arity(params, named_params)):
+            return
+
+        arg_status = dict((a, MethodSignatureChecker._NEEDED)
+                          for a in self._required_args)
+        for arg in self._default_args:
+            arg_status[arg] = MethodSignatureChecker._DEFAULT
+
         # Check that each positional param is valid.
         for i in range(len(params)):
             try:
@@ -2062,10 +2216,22 @@ class MethodGroup(object):
         """
         self._group_name = group_name
         self._exception_list = exception_list
+        # The group's methods keyed by name. A call can only equal methods
+        # with its own name, so only those are compared against it.
+        self._methods_by_name = {}
 
     def group_name(self):
         return self._group_name
 
+    def _IndexMethod(self, mock_method):
+        """Add a method to the index of this group's methods by name."""
+        self._methods_by_name.setdefault(
+            mock_method._name, []).append(mock_method)
+
+    def _MethodsNamedLike(self, mock_method):
+        """Return the indexed methods that have mock_method's name."""
+        return self._methods_by_name.get(mock_method._name, [])
+
     def __str__(self):
         return '<%s "%s">' % (self.__class__.__name__, self._group_name)
 
@@ -2104,6 +2270,7 @@ class UnorderedGroup(MethodGroup):
         """
 
         self._methods.append(mock_method)
+        self._IndexMethod(mock_method)
 
     def MethodCalled(self, mock_method):
         """Remove a method call from the group.
@@ -2123,15 +2290,20 @@ class UnorderedGroup(MethodGroup):
         """
 
         # Check to see if this method exists, and if so, remove it from the set
-        # and return it.
-        for method in self._methods:
+        # and the name index, so only pending methods are compared, and
+        # return it.
+        same_name = self._MethodsNamedLike(mock_method)
+        for index, method in enumerate(same_name):
             if method == mock_method:
-                # Remove the called mock_method instead of the method in the
-                # group. The called method will match any comparators when
-                # equality is checked during removal. The method in the group
-                # could pass a comparator to another comparator during the
-                # equality check.
-                self._methods.remove(mock_method)
+                # Remove the matched method by identity. Comparing again
+                # would run its comparators a second time, and the method in
+                # the group could pass a comparator to another comparator
+                # during that equality check.
+                del same_name[index]
+                for pending_index, pending in enumerate(self._methods):
+                    if pending is method:
+                        del self._methods[pending_index]
+                        break
 
                 # If this group is not empty, put it back at the head of the
                 # queue.
@@ -2171,6 +2343,8 @@ class MultipleTimesGroup(MethodGroup):
           mock_method: A mock method to be added to this group.
         """
 
+        if mock_method not in self._methods:
+            self._IndexMethod(mock_method)
         self._methods.add(mock_method)
         self._methods_left.add(mock_method)
 
@@ -2193,7 +2367,7 @@ class MultipleTimesGroup(MethodGroup):
 
         # Check to see if this method exists, and if so add it to the set of
         # called methods.
-        for method in self._methods:
+        for method in self._MethodsNamedLike(mock_method):
             if method == mock_method:
                 self._methods_left.discard(method)
                 # Always put this group back on top of the queue, because we
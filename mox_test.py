@@ -16,10 +16,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+"""Unit tests for Mox.
+
+PYTEST_DONT_REWRITE
+"""
+
+try:
+    import abc
+except ImportError:
+    abc = None  # Python 2.5 and earlier
+import contextlib
+import io
 import unittest
 import re
-import six
-import sys
+import weakref
 
 import mox
 
@@ -27,7 +37,52 @@ import mox_test_helper
 
 from test_helpers.subpackage.faraway import FarAwayClass
 
-OS_LISTDIR = mox_test_helper.os.listdir
+# Regex comparators used by RegexTest; compiled once at import time.
+_RE_AB = mox.Regex(r"a\s+b")
+_RE_A_I = mox.Regex(r"A", re.IGNORECASE)
+_RE_AB_B = mox.Regex(br"a\s+b")
+_RE_AB_B_F4 = mox.Regex(br"a\s+b", flags=4)
+
+# Stateless IsA comparators shared by the comparator tests.
+_ISA_STR = mox.IsA(str)
+_ISA_DICT = mox.IsA(dict)
+_ISA_STR_LIST = [_ISA_STR, _ISA_STR]
+_ISA_CHILD = mox.IsA(mox_test_helper.ChildClassFromAnotherModule)
+
+# Stateless IgnoreArg comparator shared by the MoxTest stub tests.
+_IGNORE = mox.IgnoreArg()
+
+# Instances the unbound stub tests only pass around as the self argument.
+_EXAMPLE_INSTANCE = mox_test_helper.ExampleClass()
+
+# Dictionary matched by AndTest's advanced usage cases; never mutated.
+_ADV_DICT = {"mock": "obj", "testing": "isCOOL"}
+
+# Messages expected from ExpectedMethodCallsErrorTest.
+_EXPECTED_ONE = (
+    "Verify: Expected methods never called:\n"
+    "  0.  testMethod(1, 2) -> 'output'")
+_EXPECTED_MANY = (
+    "Verify: Expected methods never called:\n"
+    "  0.  testMethod(1, 2) -> 'output'\n"
+    "  1.  testMethod(a=1, b=2, c='only named') -> None\n"
+    "  2.  testMethod2() -> 44\n"
+    "  3.  testMethod(1, 2) -> 'output'")
+
+
+@contextlib.contextmanager
+def _NoSubTest(**unused_params):
+    yield
+
+
+def _SubTest(test_case, **params):
+    """Return test_case.subTest(**params), or a no-op context on Python 2."""
+    return getattr(test_case, 'subTest', _NoSubTest)(**params)
+
+
+def _CreateMockMethod(method_name="testMethod"):
+    """Return a MockMethod in record mode with its own empty call queue."""
+    return mox.MockMethod(method_name, [], [], False)
 
 
 class ExpectedMethodCallsErrorTest(unittest.TestCase):
@@ -37,73 +92,89 @@ class ExpectedMethodCallsErrorTest(unittest.TestCase):
         self.assertRaises(ValueError, mox.ExpectedMethodCallsError, [])
 
     def testOneError(self):
-        method = mox.MockMethod("testMethod", [], [], False)
+        method = _CreateMockMethod()
         method(1, 2).AndReturn('output')
         e = mox.ExpectedMethodCallsError([method])
-        self.assertEqual(
-            "Verify: Expected methods never called:\n"
-            "  0.  testMethod(1, 2) -> 'output'",
-            str(e))
+        self.assertEqual(_EXPECTED_ONE, str(e))
 
     def testManyErrors(self):
-        method1 = mox.MockMethod("testMethod", [], [], False)
+        method1 = _CreateMockMethod()
         method1(1, 2).AndReturn('output')
-        method2 = mox.MockMethod("testMethod", [], [], False)
+        method2 = _CreateMockMethod()
         method2(a=1, b=2, c="only named")
-        method3 = mox.MockMethod("testMethod2", [], [], False)
+        method3 = _CreateMockMethod("testMethod2")
         method3().AndReturn(44)
-        method4 = mox.MockMethod("testMethod", [], [], False)
+        method4 = _CreateMockMethod()
         method4(1, 2).AndReturn('output')
         e = mox.ExpectedMethodCallsError([method1, method2, method3, method4])
+        self.assertEqual(_EXPECTED_MANY, str(e))
+
+
+class UnexpectedMethodCallErrorTest(unittest.TestCase):
+    """Test string conversion of UnexpectedMethodCallError."""
+
+    def testNoExpectedMethod(self):
+        method = _CreateMockMethod()(1, 2)
+        e = mox.UnexpectedMethodCallError(method, None)
+        self.assertEqual("Unexpected method call testMethod(1, 2) -> None",
+                         str(e))
+
+    def testDiffAgainstExpectedMethod(self):
+        method = _CreateMockMethod()(1, 2)
+        expected = _CreateMockMethod()(1, 3)
+        e = mox.UnexpectedMethodCallError(method, expected)
+        # Changing the expected method afterwards must not change the diff.
+        expected(1, 4)
         self.assertEqual(
-            "Verify: Expected methods never called:\n"
-            "  0.  testMethod(1, 2) -> 'output'\n"
-            "  1.  testMethod(a=1, b=2, c='only named') -> None\n"
-            "  2.  testMethod2() -> 44\n"
-            "  3.  testMethod(1, 2) -> 'output'",
+            "Unexpected method call.  unexpected:-  expected:+\n"
+            "- testMethod(1, 2) -> None\n"
+            "?               ^\n"
+            "+ testMethod(1, 3) -> None\n"
+            "?               ^",
             str(e))
 
 
 class OrTest(unittest.TestCase):
     """Test Or correctly chains Comparators."""
 
-    def testValidOr(self):
-        """Or should be True if either Comparator returns True."""
-        self.assert_(mox.Or(mox.IsA(dict), mox.IsA(str)) == {})
-        self.assert_(mox.Or(mox.IsA(dict), mox.IsA(str)) == 'test')
-        self.assert_(mox.Or(mox.IsA(str), mox.IsA(str)) == 'test')
+    CASES = (
+        (mox.Or(_ISA_DICT, _ISA_STR), {}, True),
+        (mox.Or(_ISA_DICT, _ISA_STR), 'test', True),
+        (mox.Or(_ISA_STR, _ISA_STR), 'test', True),
+        (mox.Or(_ISA_DICT, _ISA_STR), 0, False),
+    )
 
-    def testInvalidOr(self):
-        """Or should be False if both Comparators return False."""
-        self.failIf(mox.Or(mox.IsA(dict), mox.IsA(str)) == 0)
+    def testOr(self):
+        """Or should be True if either Comparator returns True, and False if
+        both Comparators return False."""
+        for comparator, rhs, expected in self.CASES:
+            with _SubTest(self, comparator=comparator, rhs=rhs):
+                self.assertEqual(comparator == rhs, expected)
 
 
 class AndTest(unittest.TestCase):
-    """Test And correctly chains Comparators."""
-
-    def testValidAnd(self):
-        """And should be True if both Comparators return True."""
-        self.assert_(mox.And(mox.IsA(str), mox.IsA(str)) == '1')
-
-    def testClauseOneFails(self):
-        """And should be False if the first Comparator returns False."""
-
-        self.failIf(mox.And(mox.IsA(dict), mox.IsA(str)) == '1')
+    """Test And correctly chains Comparators.
 
-    def testAdvancedUsage(self):
-        """And should work with other Comparators.
-
-        Note: this test is reliant on In and ContainsKeyValue.
-        """
-        test_dict = {"mock": "obj", "testing": "isCOOL"}
-        self.assert_(mox.And(mox.In("testing"),
-                             mox.ContainsKeyValue("mock", "obj")) == test_dict)
+    Note: the advanced usage cases are reliant on In and ContainsKeyValue.
+    """
 
-    def testAdvancedUsageFails(self):
-        """Note: this test is reliant on In and ContainsKeyValue."""
-        test_dict = {"mock": "obj", "testing": "isCOOL"}
-        self.failIf(mox.And(mox.In("NOTFOUND"),
-                            mox.ContainsKeyValue("mock", "obj")) == test_dict)
+    CASES = (
+        # And should be True if both Comparators return True.
+        (mox.And(_ISA_STR, _ISA_STR), '1', True),
+        # And should be False if the first Comparator returns False.
+        (mox.And(_ISA_DICT, _ISA_STR), '1', False),
+        # And should work with other Comparators.
+        (mox.And(mox.In("testing"), mox.ContainsKeyValue("mock", "obj")),
+         _ADV_DICT, True),
+        (mox.And(mox.In("NOTFOUND"), mox.ContainsKeyValue("mock", "obj")),
+         _ADV_DICT, False),
+    )
+
+    def testAnd(self):
+        """And should be True only if all Comparators return True."""
+        for comparator, rhs, expected in self.CASES:
+            with _SubTest(self, comparator=comparator, rhs=rhs):
+                self.assertEqual(comparator == rhs, expected)
 
 
 class FuncTest(unittest.TestCase):
@@ -118,12 +189,12 @@ class FuncTest(unittest.TestCase):
         def always_none(x):
             return None
 
-        self.assert_(mox.Func(equals_one) == 1)
-        self.failIf(mox.Func(equals_one) == 0)
+        self.assertEqual(mox.Func(equals_one), 1)
+        self.assertNotEqual(mox.Func(equals_one), 0)
 
-        self.failIf(mox.Func(always_none) == 1)
-        self.failIf(mox.Func(always_none) == 0)
-        self.failIf(mox.Func(always_none) is None)
+        self.assertNotEqual(mox.Func(always_none), 1)
+        self.assertNotEqual(mox.Func(always_none), 0)
+        self.assertIsNotNone(mox.Func(always_none))
 
     def testFuncExceptionPropagation(self):
         """Exceptions within the validating function should propagate."""
@@ -137,7 +208,7 @@ class FuncTest(unittest.TestCase):
             else:
                 return True
 
-        self.assert_(mox.Func(raiseExceptionOnNotOne) == 1)
+        self.assertEqual(mox.Func(raiseExceptionOnNotOne), 1)
         self.assertRaises(
             TestException,
             mox.Func(raiseExceptionOnNotOne).__eq__,
@@ -151,35 +222,36 @@ class SameElementsAsTest(unittest.TestCase):
 
     def testSortedLists(self):
         """Should return True if two lists are exactly equal."""
-        self.assert_(mox.SameElementsAs([1, 2.0, 'c']) == [1, 2.0, 'c'])
+        self.assertEqual(mox.SameElementsAs([1, 2.0, 'c']), [1, 2.0, 'c'])
 
     def testUnsortedLists(self):
         """Should return True if two lists are unequal but have same elements.
         """
-        self.assert_(mox.SameElementsAs([1, 2.0, 'c']) == [2.0, 'c', 1])
+        self.assertEqual(mox.SameElementsAs([1, 2.0, 'c']), [2.0, 'c', 1])
 
     def testUnhashableLists(self):
         """Should return True if two lists have the same unhashable elements.
         """
-        self.assert_(mox.SameElementsAs([{'a': 1}, {2: 'b'}]) ==
-                     [{2: 'b'}, {'a': 1}])
+        self.assertEqual(mox.SameElementsAs([{'a': 1}, {2: 'b'}]),
+                         [{2: 'b'}, {'a': 1}])
 
     def testEmptyLists(self):
         """Should return True for two empty lists."""
-        self.assert_(mox.SameElementsAs([]) == [])
+        self.assertEqual(mox.SameElementsAs([]), [])
 
     def testUnequalLists(self):
         """Should return False if the lists are not equal."""
-        self.failIf(mox.SameElementsAs([1, 2.0, 'c']) == [2.0, 'c'])
+        self.assertNotEqual(mox.SameElementsAs([1, 2.0, 'c']), [2.0, 'c'])
 
     def testUnequalUnhashableLists(self):
         """Should return False if two lists with unhashable elements are
         unequal."""
-        self.failIf(mox.SameElementsAs([{'a': 1}, {2: 'b'}]) == [{2: 'b'}])
+        self.assertNotEqual(mox.SameElementsAs([{'a': 1}, {2: 'b'}]),
+                            [{2: 'b'}])
 
     def testActualIsNotASequence(self):
         """Should return False if the actual object is not a sequence."""
-        self.failIf(mox.SameElementsAs([1]) == object())
+        self.assertNotEqual(mox.SameElementsAs([1]), object())
 
     def testOneUnhashableObjectInActual(self):
         """Store the entire iterator for a correct comparison.
@@ -189,24 +261,27 @@ class SameElementsAsTest(unittest.TestCase):
         list
         appeared smaller than it was.
         """
-        self.failIf(mox.SameElementsAs([1, 2]) == iter([{}, 1, 2]))
+        self.assertNotEqual(mox.SameElementsAs([1, 2]), iter([{}, 1, 2]))
 
 
 class ContainsKeyValueTest(unittest.TestCase):
     """Test ContainsKeyValue correctly identifies key/value pairs in a dict.
     """
 
-    def testValidPair(self):
-        """Should return True if the key value is in the dict."""
-        self.assert_(mox.ContainsKeyValue("key", 1) == {"key": 1})
+    CASES = (
+        # The key value is in the dict.
+        (mox.ContainsKeyValue("key", 1), {"key": 1}, True),
+        # The value is not correct.
+        (mox.ContainsKeyValue("key", 1), {"key": 2}, False),
+        # The key is not in the dict.
+        (mox.ContainsKeyValue("qux", 1), {"key": 2}, False),
+    )
 
-    def testInvalidValue(self):
-        """Should return False if the value is not correct."""
-        self.failIf(mox.ContainsKeyValue("key", 1) == {"key": 2})
-
-    def testInvalidKey(self):
-        """Should return False if they key is not in the dict."""
-        self.failIf(mox.ContainsKeyValue("qux", 1) == {"key": 2})
+    def testContainsKeyValue(self):
+        """Should return True only if the key/value pair is in the dict."""
+        for comparator, rhs, expected in self.CASES:
+            with _SubTest(self, comparator=comparator, rhs=rhs):
+                self.assertEqual(comparator == rhs, expected)
 
 
 class ContainsAttributeValueTest(unittest.TestCase):
@@ -215,92 +290,84 @@ class ContainsAttributeValueTest(unittest.TestCase):
 
     def setUp(self):
         """Create an object to test with."""
-
-        class TestObject(object):
-            key = 1
-
-        self.test_object = TestObject()
+        self.test_object = ClassWithKeyAttribute()
 
     def testValidPair(self):
         """Should return True if the object has the key attribute and it
         matches."""
-        self.assert_(mox.ContainsAttributeValue("key", 1) == self.test_object)
+        self.assertEqual(mox.ContainsAttributeValue("key", 1),
+                         self.test_object)
 
     def testInvalidValue(self):
         """Should return False if the value is not correct."""
-        self.failIf(mox.ContainsKeyValue("key", 2) == self.test_object)
+        self.assertNotEqual(mox.ContainsKeyValue("key", 2), self.test_object)
 
     def testInvalidKey(self):
         """Should return False if they the object doesn't have the property."""
-        self.failIf(mox.ContainsKeyValue("qux", 1) == self.test_object)
+        self.assertNotEqual(mox.ContainsKeyValue("qux", 1), self.test_object)
 
 
 class InTest(unittest.TestCase):
     """Test In correctly identifies a key in a list/dict"""
 
-    def testItemInList(self):
-        """Should return True if the item is in the list."""
-        self.assert_(mox.In(1) == [1, 2, 3])
-
-    def testKeyInDict(self):
-        """Should return True if the item is a key in a dict."""
-        self.assert_(mox.In("test") == {"test": "module"})
+    CASES = (
+        # Item in a list, key in a dict, item in a tuple.
+        (1, [1, 2, 3], True),
+        ("test", {"test": "module"}, True),
+        (1, (1, 2, 3), True),
+        ((1, 2, 3), ((1, 2, 3), (1, 2)), True),
+        (1, [2, 3], False),
+        ((1, 2), ((1, 2, 3), (4, 5)), False),
+    )
 
-    def testItemInTuple(self):
-        """Should return True if the item is in the list."""
-        self.assert_(mox.In(1) == (1, 2, 3))
-
-    def testTupleInTupleOfTuples(self):
-        self.assert_(mox.In((1, 2, 3)) == ((1, 2, 3), (1, 2)))
-
-    def testItemNotInList(self):
-        self.failIf(mox.In(1) == [2, 3])
-
-    def testTupleNotInTupleOfTuples(self):
-        self.failIf(mox.In((1, 2)) == ((1, 2, 3), (4, 5)))
+    def testIn(self):
+        """Should return True only if the item is in the sequence or map."""
+        for key, rhs, expected in self.CASES:
+            with _SubTest(self, key=key, rhs=rhs):
+                self.assertEqual(mox.In(key) == rhs, expected)
 
 
 class NotTest(unittest.TestCase):
     """Test Not correctly identifies False predicates."""
 
-    def testItemInList(self):
-        """Should return True if the item is NOT in the list."""
-        self.assert_(mox.Not(mox.In(42)) == [1, 2, 3])
+    CASES = (
+        # The item is NOT in the list.
+        (mox.Not(mox.In(42)), [1, 2, 3], True),
+        # The item is NOT a key in a dict.
+        (mox.Not(mox.In("foo")), {"key": 42}, True),
+        # The key is NOT in the dict.
+        (mox.Not(mox.ContainsKeyValue("qux", 1)), {"key": 2}, True),
+        (mox.Not(mox.In(1)), [1, 2, 3], False),
+    )
 
-    def testKeyInDict(self):
-        """Should return True if the item is NOT a key in a dict."""
-        self.assert_(mox.Not(mox.In("foo")) == {"key": 42})
-
-    def testInvalidKeyWithNot(self):
-        """Should return False if they key is NOT in the dict."""
-        self.assert_(mox.Not(mox.ContainsKeyValue("qux", 1)) == {"key": 2})
+    def testNot(self):
+        """Should return True only if the predicate is False."""
+        for comparator, rhs, expected in self.CASES:
+            with _SubTest(self, comparator=comparator, rhs=rhs):
+                self.assertEqual(comparator == rhs, expected)
 
 
 class StrContainsTest(unittest.TestCase):
     """Test StrContains correctly checks for substring occurrence of a
     parameter."""
 
-    def testValidSubstringAtStart(self):
-        """Should return True if the substring is at the start of the
-        string."""
-        self.assert_(mox.StrContains("hello") == "hello world")
-
-    def testValidSubstringInMiddle(self):
-        """Should return True if the substring is in the middle of the
-        string."""
-        self.assert_(mox.StrContains("lo wo") == "hello world")
-
-    def testValidSubstringAtEnd(self):
-        """Should return True if the substring is at the end of the string."""
-        self.assert_(mox.StrContains("ld") == "hello world")
-
-    def testInvaildSubstring(self):
-        """Should return False if the substring is not in the string."""
-        self.failIf(mox.StrContains("AAA") == "hello world")
-
-    def testMultipleMatches(self):
-        """Should return True if there are multiple occurances of substring."""
-        self.assert_(mox.StrContains("abc") == "ababcabcabcababc")
+    CASES = (
+        # Substring at the start, in the middle and at the end of the string.
+        ("hello", "hello world", True),
+        ("lo wo", "hello world", True),
+        ("ld", "hello world", True),
+        # Substring not in the string.
+        ("AAA", "hello world", False),
+        # Multiple occurances of the substring.
+        ("abc", "ababcabcabcababc", True),
+    )
+
+    def testStrContains(self):
+        """Should return True only if the substring is in the string."""
+        for search_string, rhs, expected in self.CASES:
+            with _SubTest(self, search_string=search_string, rhs=rhs):
+                self.assertEqual(mox.StrContains(search_string) == rhs,
+                                 expected)
 
 
 class RegexTest(unittest.TestCase):
@@ -316,31 +383,32 @@ class RegexTest(unittest.TestCase):
 
         This ensures that re.search is used (instead of re.find).
         """
-        self.assert_(mox.Regex(r"a\s+b") == "x y z a b c")
+        self.assertEqual(_RE_AB, "x y z a b c")
 
     def testNonMatchPattern(self):
         """Should return False if the pattern does not match the string."""
-        self.failIf(mox.Regex(r"a\s+b") == "x y z")
+        self.assertNotEqual(_RE_AB, "x y z")
 
     def testFlagsPassedCorrectly(self):
         """Should return True as we pass IGNORECASE flag."""
-        self.assert_(mox.Regex(r"A", re.IGNORECASE) == "a")
+        self.assertEqual(_RE_A_I, "a")
 
     def testReprWithoutFlags(self):
         """repr should return the regular expression pattern."""
-        self.assertEqual(
-            repr(mox.Regex(six.b(r"a\s+b"))), "<regular expression 'a\s+b'>")
+        self.assertEqual(repr(_RE_AB_B), r"<regular expression 'a\s+b'>")
 
     def testReprWithFlags(self):
         """repr should return the regular expression pattern and flags."""
-        self.assertEqual(repr(mox.Regex(six.b(r"a\s+b"), flags=4)),
-                         "<regular expression 'a\s+b', flags=4>")
+        self.assertEqual(repr(_RE_AB_B_F4),
+                         r"<regular expression 'a\s+b', flags=4>")
 
 
 class IsTest(unittest.TestCase):
     """Verify Is correctly checks equality based upon identity, not value"""
 
     class AlwaysComparesTrue(object):
+        __slots__ = ()
+
         def __eq__(self, other):
             return True
 
@@ -389,39 +457,38 @@ class IsATest(unittest.TestCase):
     """Verify IsA correctly checks equality based upon class type, not
     value."""
 
-    def testEqualityValid(self):
-        """Verify that == correctly identifies objects of the same type."""
-        self.assert_(mox.IsA(str) == 'test')
-
-    def testEqualityInvalid(self):
-        """Verify that == correctly identifies objects of different types."""
-        self.failIf(mox.IsA(str) == 10)
+    CASES = (
+        ('test', True),
+        (10, False),
+    )
 
-    def testInequalityValid(self):
-        """Verify that != identifies objects of different type."""
-        self.assert_(mox.IsA(str) != 10)
+    def testEquality(self):
+        """Verify that == correctly identifies objects by type."""
+        for rhs, same_type in self.CASES:
+            with _SubTest(self, rhs=rhs):
+                self.assertEqual(_ISA_STR == rhs, same_type)
 
-    def testInequalityInvalid(self):
-        """Verify that != correctly identifies objects of the same type."""
-        self.failIf(mox.IsA(str) != "test")
+    def testInequality(self):
+        """Verify that != correctly identifies objects by type."""
+        for rhs, same_type in self.CASES:
+            with _SubTest(self, rhs=rhs):
+                self.assertEqual(_ISA_STR != rhs, not same_type)
 
     def testEqualityInListValid(self):
         """Verify list contents are properly compared."""
-        isa_list = [mox.IsA(str), mox.IsA(str)]
         str_list = ["abc", "def"]
-        self.assert_(isa_list == str_list)
+        self.assertEqual(_ISA_STR_LIST, str_list)
 
     def testEquailtyInListInvalid(self):
         """Verify list contents are properly compared."""
-        isa_list = [mox.IsA(str), mox.IsA(str)]
         mixed_list = ["abc", 123]
-        self.failIf(isa_list == mixed_list)
+        self.assertNotEqual(_ISA_STR_LIST, mixed_list)
 
     def testSpecialTypes(self):
         """Verify that IsA can handle objects like cStringIO.StringIO."""
-        isA = mox.IsA(six.StringIO())
-        stringIO = six.StringIO()
-        self.assert_(isA == stringIO)
+        isA = mox.IsA(io.StringIO())
+        stringIO = io.StringIO()
+        self.assertEqual(isA, stringIO)
 
 
 class IsAlmostTest(unittest.TestCase):
@@ -429,60 +496,56 @@ class IsAlmostTest(unittest.TestCase):
 
     def testEqualityValid(self):
         """Verify that == correctly identifies nearly equivalent floats."""
-        self.assertEquals(mox.IsAlmost(1.8999999999), 1.9)
+        self.assertEqual(mox.IsAlmost(1.8999999999), 1.9)
 
     def testEqualityInvalid(self):
         """Verify that == correctly identifies non-equivalent floats."""
-        self.assertNotEquals(mox.IsAlmost(1.899), 1.9)
+        self.assertNotEqual(mox.IsAlmost(1.899), 1.9)
 
     def testEqualityWithPlaces(self):
         """Verify that specifying places has the desired effect."""
-        self.assertNotEquals(mox.IsAlmost(1.899), 1.9)
-        self.assertEquals(mox.IsAlmost(1.899, places=2), 1.9)
+        self.assertNotEqual(mox.IsAlmost(1.899), 1.9)
+        self.assertEqual(mox.IsAlmost(1.899, places=2), 1.9)
 
     def testNonNumericTypes(self):
         """Verify that IsAlmost handles non-numeric types properly."""
 
-        self.assertNotEquals(mox.IsAlmost(1.8999999999), '1.9')
-        self.assertNotEquals(mox.IsAlmost('1.8999999999'), 1.9)
-        self.assertNotEquals(mox.IsAlmost('1.8999999999'), '1.9')
+        self.assertNotEqual(mox.IsAlmost(1.8999999999), '1.9')
+        self.assertNotEqual(mox.IsAlmost('1.8999999999'), 1.9)
+        self.assertNotEqual(mox.IsAlmost('1.8999999999'), '1.9')
 
 
 class ValueRememberTest(unittest.TestCase):
     """Verify comparing argument against remembered value."""
 
+    EMPTIES = (None, False, 0, '', (), [], {}, object(), set())
+
     def testValueEquals(self):
         """Verify that value will compare to stored value."""
         value = mox.Value()
         value.store_value('hello world')
-        self.assertEquals(value, 'hello world')
+        self.assertEqual(value, 'hello world')
 
     def testNoValue(self):
         """Verify that uninitialized value does not compare to "empty"
         values."""
         value = mox.Value()
-        self.assertNotEquals(value, None)
-        self.assertNotEquals(value, False)
-        self.assertNotEquals(value, 0)
-        self.assertNotEquals(value, '')
-        self.assertNotEquals(value, ())
-        self.assertNotEquals(value, [])
-        self.assertNotEquals(value, {})
-        self.assertNotEquals(value, object())
-        self.assertNotEquals(value, set())
+        for empty in self.EMPTIES:
+            with _SubTest(self, empty=empty):
+                self.assertNotEqual(value, empty)
 
     def testRememberValue(self):
         """Verify that comparing against remember will store argument."""
         value = mox.Value()
         remember = mox.Remember(value)
         # value not yet stored.
-        self.assertNotEquals(value, 'hello world')
+        self.assertNotEqual(value, 'hello world')
 
         # store value here.
-        self.assertEquals(remember, 'hello world')
+        self.assertEqual(remember, 'hello world')
 
         # compare against stored value.
-        self.assertEquals(value, 'hello world')
+        self.assertEqual(value, 'hello world')
 
 
 class MockMethodTest(unittest.TestCase):
@@ -500,19 +563,25 @@ class MockMethodTest(unittest.TestCase):
 
     def testNameAttribute(self):
         """Should provide a __name__ attribute."""
-        self.assertEquals('testMethod', self.mock_method.__name__)
+        self.assertEqual('testMethod', self.mock_method.__name__)
+
+    def testWeakReferenceAndAttributes(self):
+        """Should behave like a plain callable: weakref-able and taggable."""
+        self.assertIs(self.mock_method, weakref.ref(self.mock_method)())
+        self.mock_method.some_attr = 'tag'
+        self.assertEqual('tag', self.mock_method.some_attr)
 
     def testAndReturnNoneByDefault(self):
         """Should return None by default."""
         return_value = self.mock_method(['original'])
-        self.assert_(return_value is None)
+        self.assertIsNone(return_value)
 
     def testAndReturnValue(self):
         """Should return a specificed return value."""
         expected_return_value = "test"
         self.expected_method.AndReturn(expected_return_value)
         return_value = self.mock_method(['original'])
-        self.assert_(return_value == expected_return_value)
+        self.assertEqual(return_value, expected_return_value)
 
     def testAndRaiseException(self):
         """Should raise a specified exception."""
@@ -530,7 +599,7 @@ class MockMethodTest(unittest.TestCase):
 
         self.expected_method.WithSideEffects(modifier).AndReturn(1)
         self.mock_method(local_list)
-        self.assertEquals('mutation', local_list[0])
+        self.assertEqual('mutation', local_list[0])
 
     def testWithReturningSideEffects(self):
         """Should call state modifier and propagate its return value."""
@@ -544,8 +613,8 @@ class MockMethodTest(unittest.TestCase):
 
         self.expected_method.WithSideEffects(modifier_with_return)
         actual_return = self.mock_method(local_list)
-        self.assertEquals('mutation', local_list[0])
-        self.assertEquals(expected_return, actual_return)
+        self.assertEqual('mutation', local_list[0])
+        self.assertEqual(expected_return, actual_return)
 
     def testWithReturningSideEffectsWithAndReturn(self):
         """Should call state modifier and ignore its return value."""
@@ -561,8 +630,8 @@ class MockMethodTest(unittest.TestCase):
         self.expected_method.WithSideEffects(modifier_with_return).AndReturn(
             expected_return)
         actual_return = self.mock_method(local_list)
-        self.assertEquals('mutation', local_list[0])
-        self.assertEquals(expected_return, actual_return)
+        self.assertEqual('mutation', local_list[0])
+        self.assertEqual(expected_return, actual_return)
 
     def testEqualityNoParamsEqual(self):
         """Methods with the same name and without params should be equal."""
@@ -573,7 +642,7 @@ class MockMethodTest(unittest.TestCase):
         """Methods with different names and without params should not be
         equal."""
         expected_method = mox.MockMethod("otherMethod", [], [], False)
-        self.failIfEqual(self.mock_method, expected_method)
+        self.assertNotEqual(self.mock_method, expected_method)
 
     def testEqualityParamsEqual(self):
         """Methods with the same name and parameters should be equal."""
@@ -591,7 +660,7 @@ class MockMethodTest(unittest.TestCase):
         expected_method._params = [1, 2, 3]
 
         self.mock_method._params = ['a', 'b', 'c']
-        self.failIfEqual(self.mock_method, expected_method)
+        self.assertNotEqual(self.mock_method, expected_method)
 
     def testEqualityNamedParamsEqual(self):
         """Methods with the same name and same named params should be equal."""
@@ -612,11 +681,11 @@ class MockMethodTest(unittest.TestCase):
             "input1": "test2",
             "input2": "params2"
         }
-        self.failIfEqual(self.mock_method, expected_method)
+        self.assertNotEqual(self.mock_method, expected_method)
 
     def testEqualityWrongType(self):
         """Method should not be equal to an object of a different type."""
-        self.failIfEqual(self.mock_method, "string?")
+        self.assertNotEqual(self.mock_method, "string?")
 
     def testObjectEquality(self):
         """Equality of objects should work without a Comparator"""
@@ -630,42 +699,31 @@ class MockMethodTest(unittest.TestCase):
         self.mock_method._params = [instB, ]
         self.assertEqual(self.mock_method, expected_method)
 
-    def testStrConversion(self):
-        method = mox.MockMethod("f", [], [], False)
-        method(1, 2, "st", n1=8, n2="st2")
-        self.assertEqual(
-            str(method),
-            "f(1, 2, 'st', n1=8, n2='st2') -> None"
-        )
+    STR_CONVERSION_CASES = (
+        ("f", (1, 2, "st"), {"n1": 8, "n2": "st2"},
+         "f(1, 2, 'st', n1=8, n2='st2') -> None"),
+        ("testMethod", (1, 2, "only positional"), {},
+         "testMethod(1, 2, 'only positional') -> None"),
+        ("testMethod", (), {"a": 1, "b": 2, "c": "only named"},
+         "testMethod(a=1, b=2, c='only named') -> None"),
+        ("testMethod", (), {}, "testMethod() -> None"),
+        ("testMethod", (), {"x": "only 1 parameter"},
+         "testMethod(x='only 1 parameter') -> None"),
+    )
 
-        method = mox.MockMethod("testMethod", [], [], False)
-        method(1, 2, "only positional")
-        self.assertEqual(
-            str(method),
-            "testMethod(1, 2, 'only positional') -> None"
-        )
-
-        method = mox.MockMethod("testMethod", [], [], False)
-        method(a=1, b=2, c="only named")
-        self.assertEqual(str(method),
-                         "testMethod(a=1, b=2, c='only named') -> None")
-
-        method = mox.MockMethod("testMethod", [], [], False)
-        method()
-        self.assertEqual(str(method), "testMethod() -> None")
-
-        method = mox.MockMethod("testMethod", [], [], False)
-        method(x="only 1 parameter")
-        self.assertEqual(
-            str(method),
-            "testMethod(x='only 1 parameter') -> None"
-        )
-
-        method = mox.MockMethod("testMethod", [], [], False)
+    def testStrConversion(self):
+        for name, params, named_params, expected in self.STR_CONVERSION_CASES:
+            with _SubTest(self, expected=expected):
+                method = _CreateMockMethod(name)
+                method(*params, **named_params)
+                self.assertEqual(str(method), expected)
+
+    def testStrConversionWithReturnValue(self):
+        method = _CreateMockMethod()
         method().AndReturn('return_value')
         self.assertEqual(str(method), "testMethod() -> 'return_value'")
 
-        method = mox.MockMethod("testMethod", [], [], False)
+        method = _CreateMockMethod()
         method().AndReturn(('a', {1: 2}))
         self.assertEqual(str(method), "testMethod() -> ('a', {1: 2})")
 
@@ -675,6 +733,8 @@ class MockAnythingTest(unittest.TestCase):
 
     def setUp(self):
         self.mock_object = mox.MockAnything()
+        self._replay = self.mock_object._Replay
+        self._verify = self.mock_object._Verify
 
     def testRepr(self):
         """Calling repr on a MockAnything instance must work."""
@@ -682,64 +742,64 @@ class MockAnythingTest(unittest.TestCase):
 
     def testCanMockStr(self):
         self.mock_object.__str__().AndReturn("foo")
-        self.mock_object._Replay()
+        self._replay()
         actual = str(self.mock_object)
-        self.mock_object._Verify()
-        self.assertEquals("foo", actual)
+        self._verify()
+        self.assertEqual("foo", actual)
 
     def testSetupMode(self):
         """Verify the mock will accept any call."""
         self.mock_object.NonsenseCall()
-        self.assert_(len(self.mock_object._expected_calls_queue) == 1)
+        self.assertEqual(len(self.mock_object._expected_calls_queue), 1)
 
     def testReplayWithExpectedCall(self):
         """Verify the mock replays method calls as expected."""
         self.mock_object.ValidCall()  # setup method call
-        self.mock_object._Replay()  # start replay mode
+        self._replay()  # start replay mode
         self.mock_object.ValidCall()  # make method call
 
     def testReplayWithUnexpectedCall(self):
         """Unexpected method calls should raise UnexpectedMethodCallError."""
         self.mock_object.ValidCall()  # setup method call
-        self.mock_object._Replay()  # start replay mode
+        self._replay()  # start replay mode
         self.assertRaises(mox.UnexpectedMethodCallError,
                           self.mock_object.OtherValidCall)
 
     def testVerifyWithCompleteReplay(self):
         """Verify should not raise an exception for a valid replay."""
         self.mock_object.ValidCall()  # setup method call
-        self.mock_object._Replay()  # start replay mode
+        self._replay()  # start replay mode
         self.mock_object.ValidCall()  # make method call
-        self.mock_object._Verify()
+        self._verify()
 
     def testVerifyWithIncompleteReplay(self):
         """Verify should raise an exception if the replay was not complete."""
         self.mock_object.ValidCall()  # setup method call
-        self.mock_object._Replay()  # start replay mode
+        self._replay()  # start replay mode
         # ValidCall() is never made
         self.assertRaises(
             mox.ExpectedMethodCallsError,
-            self.mock_object._Verify
+            self._verify
         )
 
     def testSpecialClassMethod(self):
         """Verify should not raise an exception when special methods are
         used."""
         self.mock_object[1].AndReturn(True)
-        self.mock_object._Replay()
+        self._replay()
         returned_val = self.mock_object[1]
-        self.assert_(returned_val)
-        self.mock_object._Verify()
+        self.assertTrue(returned_val)
+        self._verify()
 
     def testNonzero(self):
         """You should be able to use the mock object in an if."""
-        self.mock_object._Replay()
+        self._replay()
         if self.mock_object:
             pass
 
     def testNotNone(self):
         """Mock should be comparable to None."""
-        self.mock_object._Replay()
+        self._replay()
         if self.mock_object is not None:
             pass
 
@@ -748,43 +808,43 @@ class MockAnythingTest(unittest.TestCase):
 
     def testEquals(self):
         """A mock should be able to compare itself to another object."""
-        self.mock_object._Replay()
-        self.assertEquals(self.mock_object, self.mock_object)
+        self._replay()
+        self.assertEqual(self.mock_object, self.mock_object)
 
     def testEqualsMockFailure(self):
         """Verify equals identifies unequal objects."""
         self.mock_object.SillyCall()
-        self.mock_object._Replay()
-        self.assertNotEquals(self.mock_object, mox.MockAnything())
+        self._replay()
+        self.assertNotEqual(self.mock_object, mox.MockAnything())
 
     def testEqualsInstanceFailure(self):
         """Verify equals identifies that objects are different instances."""
-        self.mock_object._Replay()
-        self.assertNotEquals(self.mock_object, TestClass())
+        self._replay()
+        self.assertNotEqual(self.mock_object, TestClass())
 
     def testNotEquals(self):
         """Verify not equals works."""
-        self.mock_object._Replay()
+        self._replay()
         self.assertFalse(self.mock_object != self.mock_object)
 
     def testNestedMockCallsRecordedSerially(self):
         """Test that nested calls work when recorded serially."""
         self.mock_object.CallInner().AndReturn(1)
         self.mock_object.CallOuter(1)
-        self.mock_object._Replay()
+        self._replay()
 
         self.mock_object.CallOuter(self.mock_object.CallInner())
 
-        self.mock_object._Verify()
+        self._verify()
 
     def testNestedMockCallsRecordedNested(self):
         """Test that nested cals work when recorded in a nested fashion."""
         self.mock_object.CallOuter(self.mock_object.CallInner().AndReturn(1))
-        self.mock_object._Replay()
+        self._replay()
 
         self.mock_object.CallOuter(self.mock_object.CallInner())
 
-        self.mock_object._Verify()
+        self._verify()
 
     def testIsCallable(self):
         """Test that MockAnything can even mock a simple callable.
@@ -793,76 +853,101 @@ class MockAnythingTest(unittest.TestCase):
         verifying that it was called.
         """
         self.mock_object().AndReturn('mox0rd')
-        self.mock_object._Replay()
+        self._replay()
 
-        self.assertEquals('mox0rd', self.mock_object())
+        self.assertEqual('mox0rd', self.mock_object())
 
-        self.mock_object._Verify()
+        self._verify()
 
     def testIsReprable(self):
         """Test that MockAnythings can be repr'd without causing a failure."""
-        self.failUnless('MockAnything' in repr(self.mock_object))
+        self.assertIn('MockAnything', repr(self.mock_object))
 
 
 class MethodCheckerTest(unittest.TestCase):
     """Tests MockMethod's use of MethodChecker method."""
 
+    def _AssertBadCalls(self, method, calls):
+        """Assert that each (params, named_params) call raises an
+        AttributeError."""
+        for params, named_params in calls:
+            with _SubTest(self, params=params, named_params=named_params):
+                with self.assertRaises(AttributeError):
+                    method(*params, **named_params)
+
+    def _CreateCheckedMethod(self, checker):
+        """Return a MockMethod named after, and checked against, checker."""
+        return mox.MockMethod(checker.__name__, [], [], False, checker)
+
+    def _AssertSameErrorAsSlowPath(self, method, calls):
+        """Assert that each bad (params, named_params) call fails the fixed
+        arity fast path with the error of the full check."""
+        checker = mox.MethodSignatureChecker(method)
+        self.assertIsNotNone(checker._fits_fixed_arity)
+        slow_checker = mox.MethodSignatureChecker(method)
+        slow_checker._fits_fixed_arity = None
+        for params, named_params in calls:
+            with _SubTest(self, params=params, named_params=named_params):
+                with self.assertRaises(AttributeError) as slow:
+                    slow_checker.Check(params, named_params)
+                with self.assertRaises(AttributeError) as fast:
+                    checker.Check(params, named_params)
+                self.assertEqual(str(slow.exception), str(fast.exception))
+
     def testNoParameters(self):
-        method = mox.MockMethod('NoParameters', [], [], False,
-                                CheckCallTestClass.NoParameters)
+        method = self._CreateCheckedMethod(CheckCallTestClass.NoParameters)
         method()
-        self.assertRaises(AttributeError, method, 1)
-        self.assertRaises(AttributeError, method, 1, 2)
-        self.assertRaises(AttributeError, method, a=1)
-        self.assertRaises(AttributeError, method, 1, b=2)
+        self._AssertBadCalls(method, (
+            ((1,), {}),
+            ((1, 2), {}),
+            ((), {'a': 1}),
+            ((1,), {'b': 2}),
+        ))
 
     def testOneParameter(self):
-        method = mox.MockMethod('OneParameter', [], [], False,
-                                CheckCallTestClass.OneParameter)
-        self.assertRaises(AttributeError, method)
+        method = self._CreateCheckedMethod(CheckCallTestClass.OneParameter)
         method(1)
         method(a=1)
-        self.assertRaises(AttributeError, method, b=1)
-        self.assertRaises(AttributeError, method, 1, 2)
-        self.assertRaises(AttributeError, method, 1, a=2)
-        self.assertRaises(AttributeError, method, 1, b=2)
+        self._AssertBadCalls(method, (
+            ((), {}),
+            ((), {'b': 1}),
+            ((1, 2), {}),
+            ((1,), {'a': 2}),
+            ((1,), {'b': 2}),
+        ))
 
     def testTwoParameters(self):
-        method = mox.MockMethod('TwoParameters', [], [], False,
-                                CheckCallTestClass.TwoParameters)
-        self.assertRaises(AttributeError, method)
-        self.assertRaises(AttributeError, method, 1)
-        self.assertRaises(AttributeError, method, a=1)
-        self.assertRaises(AttributeError, method, b=1)
+        method = self._CreateCheckedMethod(CheckCallTestClass.TwoParameters)
         method(1, 2)
         method(1, b=2)
         method(a=1, b=2)
         method(b=2, a=1)
-        self.assertRaises(AttributeError, method, b=2, c=3)
-        self.assertRaises(AttributeError, method, a=1, b=2, c=3)
-        self.assertRaises(AttributeError, method, 1, 2, 3)
-        self.assertRaises(AttributeError, method, 1, 2, 3, 4)
-        self.assertRaises(AttributeError, method, 3, a=1, b=2)
+        self._AssertBadCalls(method, (
+            ((), {}),
+            ((1,), {}),
+            ((), {'a': 1}),
+            ((), {'b': 1}),
+            ((), {'b': 2, 'c': 3}),
+            ((), {'a': 1, 'b': 2, 'c': 3}),
+            ((1, 2, 3), {}),
+            ((1, 2, 3, 4), {}),
+            ((3,), {'a': 1, 'b': 2}),
+        ))
 
     def testOneDefaultValue(self):
-        method = mox.MockMethod('OneDefaultValue', [], [], False,
-                                CheckCallTestClass.OneDefaultValue)
+        method = self._CreateCheckedMethod(CheckCallTestClass.OneDefaultValue)
         method()
         method(1)
         method(a=1)
-        self.assertRaises(AttributeError, method, b=1)
-        self.assertRaises(AttributeError, method, 1, 2)
-        self.assertRaises(AttributeError, method, 1, a=2)
-        self.assertRaises(AttributeError, method, 1, b=2)
+        self._AssertBadCalls(method, (
+            ((), {'b': 1}),
+            ((1, 2), {}),
+            ((1,), {'a': 2}),
+            ((1,), {'b': 2}),
+        ))
 
     def testTwoDefaultValues(self):
-        method = mox.MockMethod('TwoDefaultValues', [], [], False,
-                                CheckCallTestClass.TwoDefaultValues)
-        self.assertRaises(AttributeError, method)
-        self.assertRaises(AttributeError, method, c=3)
-        self.assertRaises(AttributeError, method, 1)
-        self.assertRaises(AttributeError, method, 1, d=4)
-        self.assertRaises(AttributeError, method, 1, d=4, c=3)
+        method = self._CreateCheckedMethod(CheckCallTestClass.TwoDefaultValues)
         method(1, 2)
         method(a=1, b=2)
         method(1, 2, 3)
@@ -871,73 +956,113 @@ class MethodCheckerTest(unittest.TestCase):
         method(1, 2, c=3, d=4)
         method(1, 2, d=4, c=3)
         method(d=4, c=3, a=1, b=2)
-        self.assertRaises(AttributeError, method, 1, 2, 3, 4, 5)
-        self.assertRaises(AttributeError, method, 1, 2, e=9)
-        self.assertRaises(AttributeError, method, a=1, b=2, e=9)
+        self._AssertBadCalls(method, (
+            ((), {}),
+            ((), {'c': 3}),
+            ((1,), {}),
+            ((1,), {'d': 4}),
+            ((1,), {'d': 4, 'c': 3}),
+            ((1, 2, 3, 4, 5), {}),
+            ((1, 2), {'e': 9}),
+            ((), {'a': 1, 'b': 2, 'e': 9}),
+        ))
 
     def testArgs(self):
-        method = mox.MockMethod('Args', [], [], False, CheckCallTestClass.Args)
-        self.assertRaises(AttributeError, method)
-        self.assertRaises(AttributeError, method, 1)
+        method = self._CreateCheckedMethod(CheckCallTestClass.Args)
         method(1, 2)
         method(a=1, b=2)
         method(1, 2, 3)
         method(1, 2, 3, 4)
-        self.assertRaises(AttributeError, method, 1, 2, a=3)
-        self.assertRaises(AttributeError, method, 1, 2, c=3)
+        self._AssertBadCalls(method, (
+            ((), {}),
+            ((1,), {}),
+            ((1, 2), {'a': 3}),
+            ((1, 2), {'c': 3}),
+        ))
 
     def testKwargs(self):
-        method = mox.MockMethod(
-            'Kwargs',
-            [],
-            [],
-            False,
-            CheckCallTestClass.Kwargs
-        )
-        self.assertRaises(AttributeError, method)
+        method = self._CreateCheckedMethod(CheckCallTestClass.Kwargs)
         method(1)
         method(1, 2)
         method(a=1, b=2)
         method(b=2, a=1)
-        self.assertRaises(AttributeError, method, 1, 2, 3)
-        self.assertRaises(AttributeError, method, 1, 2, a=3)
         method(1, 2, c=3)
         method(a=1, b=2, c=3)
         method(c=3, a=1, b=2)
         method(a=1, b=2, c=3, d=4)
-        self.assertRaises(AttributeError, method, 1, 2, 3, 4)
+        self._AssertBadCalls(method, (
+            ((), {}),
+            ((1, 2, 3), {}),
+            ((1, 2), {'a': 3}),
+            ((1, 2, 3, 4), {}),
+        ))
 
     def testArgsAndKwargs(self):
-        method = mox.MockMethod('ArgsAndKwargs', [], [], False,
-                                CheckCallTestClass.ArgsAndKwargs)
-        self.assertRaises(AttributeError, method)
+        method = self._CreateCheckedMethod(CheckCallTestClass.ArgsAndKwargs)
         method(1)
         method(1, 2)
         method(1, 2, 3)
         method(a=1)
         method(1, b=2)
-        self.assertRaises(AttributeError, method, 1, a=2)
         method(b=2, a=1)
         method(c=3, b=2, a=1)
         method(1, 2, c=3)
+        self._AssertBadCalls(method, (
+            ((), {}),
+            ((1,), {'a': 2}),
+        ))
+
+    def testUnboundWithSelfAndKeywordsMatchesSlowPath(self):
+        instance = CheckCallTestClass()
+        self._AssertSameErrorAsSlowPath(CheckCallTestClass.TwoParameters, (
+            ((instance,), {'a': 1, 'b': 2}),
+            ((instance, 1), {'b': 2}),
+            ((instance, 1, 2), {'a': 3}),
+            ((instance, 1, 2), {'c': 3}),
+        ))
+
+    def testPositionalAlsoGivenAsKeywordMatchesSlowPath(self):
+        self._AssertSameErrorAsSlowPath(CheckCallTestClass.TwoParameters, (
+            ((1,), {'a': 1, 'b': 2}),
+            ((1, 2), {'a': 3}),
+            ((1, 2), {'b': 3}),
+        ))
+
+    def testBoundAndUnboundMethodShareArgSpec(self):
+        instance = CheckCallTestClass()
+        argspec = mox._GetArgSpec(CheckCallTestClass.TwoParameters)
+        self.assertIs(argspec, mox._GetArgSpec(instance.TwoParameters))
+        self.assertEqual(('self', 'a', 'b'), argspec.args)
+        for checked in (CheckCallTestClass.TwoParameters,
+                        instance.TwoParameters):
+            method = self._CreateCheckedMethod(checked)
+            method(1, 2)
+            method(1, b=2)
+            self._AssertBadCalls(method, (
+                ((1,), {}),
+                ((1, 2, 3), {}),
+                ((1,), {'a': 2}),
+            ))
+        self.assertEqual(('self', 'a', 'b'), argspec.args)
 
     def testFarAwayClassWithInstantiatedObject(self):
         obj = FarAwayClass()
-        method = mox.MockMethod('distantMethod', [], [], False,
-                                obj.distantMethod)
-        self.assertRaises(AttributeError, method, 1)
-        self.assertRaises(AttributeError, method, a=1)
-        self.assertRaises(AttributeError, method, b=1)
-        self.assertRaises(AttributeError, method, 1, 2)
-        self.assertRaises(AttributeError, method, 1, b=2)
-        self.assertRaises(AttributeError, method, a=1, b=2)
-        self.assertRaises(AttributeError, method, b=2, a=1)
-        self.assertRaises(AttributeError, method, b=2, c=3)
-        self.assertRaises(AttributeError, method, a=1, b=2, c=3)
-        self.assertRaises(AttributeError, method, 1, 2, 3)
-        self.assertRaises(AttributeError, method, 1, 2, 3, 4)
-        self.assertRaises(AttributeError, method, 3, a=1, b=2)
+        method = self._CreateCheckedMethod(obj.distantMethod)
         method()
+        self._AssertBadCalls(method, (
+            ((1,), {}),
+            ((), {'a': 1}),
+            ((), {'b': 1}),
+            ((1, 2), {}),
+            ((1,), {'b': 2}),
+            ((), {'a': 1, 'b': 2}),
+            ((), {'b': 2, 'a': 1}),
+            ((), {'b': 2, 'c': 3}),
+            ((), {'a': 1, 'b': 2, 'c': 3}),
+            ((1, 2, 3), {}),
+            ((1, 2, 3, 4), {}),
+            ((3,), {'a': 1, 'b': 2}),
+        ))
 
 
 class CheckCallTestClass(object):
@@ -1056,7 +1181,7 @@ class MockObjectTest(unittest.TestCase):
     def testSetupModeWithValidCall(self):
         """Verify the mock object properly mocks a basic method call."""
         self.mock_object.ValidCall()
-        self.assert_(len(self.mock_object._expected_calls_queue) == 1)
+        self.assertEqual(len(self.mock_object._expected_calls_queue), 1)
 
     def testSetupModeWithInvalidCall(self):
         """UnknownMethodCallError should be raised if a non-member method is
@@ -1092,51 +1217,50 @@ class MockObjectTest(unittest.TestCase):
 
     def testIsInstance(self):
         """Mock should be able to pass as an instance of the mocked class."""
-        self.assert_(isinstance(self.mock_object, TestClass))
+        self.assertTrue(isinstance(self.mock_object, TestClass))
 
     def testFindValidMethods(self):
         """Mock should be able to mock all public methods."""
-        self.assert_('ValidCall' in self.mock_object._known_methods)
-        self.assert_('OtherValidCall' in self.mock_object._known_methods)
-        self.assert_('MyClassMethod' in self.mock_object._known_methods)
-        self.assert_('MyStaticMethod' in self.mock_object._known_methods)
-        self.assert_('_ProtectedCall' in self.mock_object._known_methods)
-        self.assert_('__PrivateCall' not in self.mock_object._known_methods)
-        self.assert_(
-            '_TestClass__PrivateCall' in self.mock_object._known_methods
-        )
+        self.assertIn('ValidCall', self.mock_object._known_methods)
+        self.assertIn('OtherValidCall', self.mock_object._known_methods)
+        self.assertIn('MyClassMethod', self.mock_object._known_methods)
+        self.assertIn('MyStaticMethod', self.mock_object._known_methods)
+        self.assertIn('_ProtectedCall', self.mock_object._known_methods)
+        self.assertNotIn('__PrivateCall', self.mock_object._known_methods)
+        self.assertIn('_TestClass__PrivateCall',
+                      self.mock_object._known_methods)
 
     def testFindsSuperclassMethods(self):
         """Mock should be able to mock superclasses methods."""
         self.mock_object = mox.MockObject(ChildClass)
-        self.assert_('ValidCall' in self.mock_object._known_methods)
-        self.assert_('OtherValidCall' in self.mock_object._known_methods)
-        self.assert_('MyClassMethod' in self.mock_object._known_methods)
-        self.assert_('ChildValidCall' in self.mock_object._known_methods)
+        self.assertIn('ValidCall', self.mock_object._known_methods)
+        self.assertIn('OtherValidCall', self.mock_object._known_methods)
+        self.assertIn('MyClassMethod', self.mock_object._known_methods)
+        self.assertIn('ChildValidCall', self.mock_object._known_methods)
 
     def testAccessClassVariables(self):
         """Class variables should be accessible through the mock."""
-        self.assert_('SOME_CLASS_VAR' in self.mock_object._known_vars)
-        self.assert_('SOME_CLASS_SET' in self.mock_object._known_vars)
-        self.assert_('_PROTECTED_CLASS_VAR' in self.mock_object._known_vars)
-        self.assertEquals('test_value', self.mock_object.SOME_CLASS_VAR)
-        self.assertEquals({'a', 'b', 'c'}, self.mock_object.SOME_CLASS_SET)
+        self.assertIn('SOME_CLASS_VAR', self.mock_object._known_vars)
+        self.assertIn('SOME_CLASS_SET', self.mock_object._known_vars)
+        self.assertIn('_PROTECTED_CLASS_VAR', self.mock_object._known_vars)
+        self.assertEqual('test_value', self.mock_object.SOME_CLASS_VAR)
+        self.assertEqual({'a', 'b', 'c'}, self.mock_object.SOME_CLASS_SET)
 
     def testEquals(self):
         """A mock should be able to compare itself to another object."""
         self.mock_object._Replay()
-        self.assertEquals(self.mock_object, self.mock_object)
+        self.assertEqual(self.mock_object, self.mock_object)
 
     def testEqualsMockFailure(self):
         """Verify equals identifies unequal objects."""
         self.mock_object.ValidCall()
         self.mock_object._Replay()
-        self.assertNotEquals(self.mock_object, mox.MockObject(TestClass))
+        self.assertNotEqual(self.mock_object, mox.MockObject(TestClass))
 
     def testEqualsInstanceFailure(self):
         """Verify equals identifies that objects are different instances."""
         self.mock_object._Replay()
-        self.assertNotEquals(self.mock_object, TestClass())
+        self.assertNotEqual(self.mock_object, TestClass())
 
     def testNotEquals(self):
         """Verify not equals works."""
@@ -1290,7 +1414,7 @@ class MockObjectTest(unittest.TestCase):
         dummy[1].AndReturn('3')
 
         dummy._Replay()
-        self.assertEquals('3', dummy.__getitem__(1))
+        self.assertEqual('3', dummy.__getitem__(1))
         dummy._Verify()
 
     def testMockIter_ExpectedIter_Success(self):
@@ -1303,7 +1427,7 @@ class MockObjectTest(unittest.TestCase):
 
         dummy._Replay()
 
-        self.assertEqual([x for x in dummy], ['X', 'Y'])
+        self.assertEqual(list(dummy), ['X', 'Y'])
 
         dummy._Verify()
 
@@ -1317,7 +1441,7 @@ class MockObjectTest(unittest.TestCase):
 
         dummy._Replay()
 
-        self.failUnless('X' in dummy)
+        self.assertIn('X', dummy)
 
         dummy._Verify()
 
@@ -1358,7 +1482,7 @@ class MockObjectTest(unittest.TestCase):
 
         dummy._Replay()
 
-        # NOT doing self.assertEqual([x for x in dummy], ['X', 'Y'])
+        # NOT doing self.assertEqual(list(dummy), ['X', 'Y'])
 
         self.assertRaises(mox.ExpectedMethodCallsError, dummy._Verify)
 
@@ -1369,7 +1493,7 @@ class MockObjectTest(unittest.TestCase):
 
         dummy._Replay()
 
-        def call(): return [x for x in dummy]
+        def call(): return list(dummy)
 
         self.assertRaises(mox.UnexpectedMethodCallError, call)
 
@@ -1381,7 +1505,7 @@ class MockObjectTest(unittest.TestCase):
         dummy[2].AndRaise(IndexError)
 
         dummy._Replay()
-        self.assertEquals(['a', 'b'], [x for x in dummy])
+        self.assertEqual(['a', 'b'], list(dummy))
         dummy._Verify()
 
     def testMockIter_ExpectedNoGetItem_NoSuccess(self):
@@ -1392,7 +1516,7 @@ class MockObjectTest(unittest.TestCase):
         dummy._Replay()
 
         def function():
-            return [x for x in dummy]
+            return list(dummy)
         self.assertRaises(mox.UnexpectedMethodCallError, function)
 
     def testMockGetIter_WithSubClassOfNewStyleClass(self):
@@ -1406,12 +1530,12 @@ class MockObjectTest(unittest.TestCase):
         dummy = mox.MockObject(TestSubClass)
         iter(dummy).AndReturn(iter(['a', 'b']))
         dummy._Replay()
-        self.assertEquals(['a', 'b'], [x for x in dummy])
+        self.assertEqual(['a', 'b'], list(dummy))
         dummy._Verify()
 
     def testInstantiationWithAdditionalAttributes(self):
         mock_object = mox.MockObject(TestClass, attrs={"attr1": "value"})
-        self.assertEquals(mock_object.attr1, "value")
+        self.assertEqual(mock_object.attr1, "value")
 
     def testCantOverrideMethodsWithAttributes(self):
         self.assertRaises(ValueError, mox.MockObject, TestClass,
@@ -1430,6 +1554,10 @@ class MoxTest(unittest.TestCase):
     def setUp(self):
         self.mox = mox.Mox()
 
+    def tearDown(self):
+        # Tests leave restoring their stubs to this, pass or fail.
+        self.mox.UnsetStubs()
+
     def testCreateObject(self):
         """Mox should create a mock object."""
         self.mox.CreateMock(TestClass)
@@ -1483,7 +1611,8 @@ class MoxTest(unittest.TestCase):
         mock_obj.ValidCall()
         self.mox.ReplayAll()
         # ValidCall() is never made
-        self.assertRaises(mox.ExpectedMethodCallsError, self.mox.VerifyAll)
+        with self.assertRaises(mox.ExpectedMethodCallsError):
+            self.mox.VerifyAll()
 
     def testEntireWorkflow(self):
         """Test the whole work flow."""
@@ -1492,7 +1621,7 @@ class MoxTest(unittest.TestCase):
         self.mox.ReplayAll()
 
         ret_val = mock_obj.ValidCall()
-        self.assertEquals("yes", ret_val)
+        self.assertEqual("yes", ret_val)
         self.mox.VerifyAll()
 
     def testSignatureMatchingWithComparatorAsFirstArg(self):
@@ -1509,7 +1638,7 @@ class MoxTest(unittest.TestCase):
         mock_obj = self.mox.CreateMock(TestClass)
         # This intentionally does not name the 'nine' param so it triggers
         # deeper inspection.
-        mock_obj.MethodWithArgs(mox.Func(VerifyLen), mox.IgnoreArg(), None)
+        mock_obj.MethodWithArgs(mox.Func(VerifyLen), _IGNORE, None)
         self.mox.ReplayAll()
 
         mock_obj.MethodWithArgs([1, 2], "foo", None)
@@ -1523,7 +1652,7 @@ class MoxTest(unittest.TestCase):
         self.mox.ReplayAll()
 
         ret_val = mock_obj("foo")
-        self.assertEquals("qux", ret_val)
+        self.assertEqual("qux", ret_val)
         self.mox.VerifyAll()
 
     def testInheritedCallableObject(self):
@@ -1534,7 +1663,7 @@ class MoxTest(unittest.TestCase):
         self.mox.ReplayAll()
 
         ret_val = mock_obj("foo")
-        self.assertEquals("qux", ret_val)
+        self.assertEqual("qux", ret_val)
         self.mox.VerifyAll()
 
     def testCallOnNonCallableObject(self):
@@ -1546,7 +1675,8 @@ class MoxTest(unittest.TestCase):
         noncallable = NonCallable()
         self.assertNotIn('__call__', dir(noncallable))
         mock_obj = self.mox.CreateMock(noncallable)
-        self.assertRaises(TypeError, mock_obj)
+        with self.assertRaises(TypeError):
+            mock_obj()
 
     def testCallableObjectWithBadCall(self):
         """Test verifying calls to a callable object works."""
@@ -1554,12 +1684,14 @@ class MoxTest(unittest.TestCase):
         mock_obj("foo").AndReturn("qux")
         self.mox.ReplayAll()
 
-        self.assertRaises(mox.UnexpectedMethodCallError, mock_obj, "ZOOBAZ")
+        with self.assertRaises(mox.UnexpectedMethodCallError):
+            mock_obj("ZOOBAZ")
 
     def testCallableObjectVerifiesSignature(self):
         mock_obj = self.mox.CreateMock(CallableClass)
         # Too many arguments
-        self.assertRaises(AttributeError, mock_obj, "foo", "bar")
+        with self.assertRaises(AttributeError):
+            mock_obj("foo", "bar")
 
     def testUnorderedGroup(self):
         """Test that using one unordered group works."""
@@ -1615,7 +1747,8 @@ class MoxTest(unittest.TestCase):
         self.mox.ReplayAll()
 
         mock_obj.Method(2)
-        self.assertRaises(mox.UnexpectedMethodCallError, mock_obj.Bar)
+        with self.assertRaises(mox.UnexpectedMethodCallError):
+            mock_obj.Bar()
 
     def testUnorderedGroupWithReturnValue(self):
         """Unordered groups should work with return values."""
@@ -1631,8 +1764,8 @@ class MoxTest(unittest.TestCase):
         actual_one = mock_obj.Method(1)
         mock_obj.Close()
 
-        self.assertEquals(9, actual_one)
-        self.assertEquals(10, actual_two)
+        self.assertEqual(9, actual_one)
+        self.assertEqual(10, actual_two)
 
         self.mox.VerifyAll()
 
@@ -1660,6 +1793,39 @@ class MoxTest(unittest.TestCase):
 
         self.mox.VerifyAll()
 
+    def testUnorderedGroupWithRepeatedNameOutOfOrder(self):
+        """Out of order calls should each consume their own pending method."""
+        mock_obj = self.mox.CreateMockAnything()
+        mock_obj.Method(1).InAnyOrder().AndReturn('first one')
+        mock_obj.Method(2).InAnyOrder().AndReturn('two')
+        mock_obj.Method(1).InAnyOrder().AndReturn('second one')
+        self.mox.ReplayAll()
+
+        self.assertEqual('two', mock_obj.Method(2))
+        self.assertEqual('first one', mock_obj.Method(1))
+        self.assertEqual('second one', mock_obj.Method(1))
+
+        self.mox.VerifyAll()
+
+    def testUnorderedGroupRunsComparatorOncePerCall(self):
+        """A matching call should run a side-effecting comparator once."""
+        calls = [0]
+
+        def IsOne(arg):
+            calls[0] += 1
+            return arg == 1
+
+        mock_obj = self.mox.CreateMockAnything()
+        mock_obj.Method(mox.Func(IsOne)).InAnyOrder()
+        mock_obj.Other().InAnyOrder()
+        self.mox.ReplayAll()
+
+        mock_obj.Method(1)
+        mock_obj.Other()
+
+        self.mox.VerifyAll()
+        self.assertEqual(1, calls[0])
+
     def testMultipleTimes(self):
         """Test if MultipleTimesGroup works."""
         mock_obj = self.mox.CreateMockAnything()
@@ -1677,12 +1843,12 @@ class MoxTest(unittest.TestCase):
 
         self.mox.VerifyAll()
 
-        self.assertEquals(9, actual_one)
+        self.assertEqual(9, actual_one)
 
         # Repeated calls should return same number.
-        self.assertEquals(9, second_one)
-        self.assertEquals(10, actual_two)
-        self.assertEquals(42, actual_three)
+        self.assertEqual(9, second_one)
+        self.assertEqual(10, actual_two)
+        self.assertEqual(42, actual_three)
 
     def testMultipleTimesUsingIsAParameter(self):
         """Test if MultipleTimesGroup works with a IsA parameter."""
@@ -1699,10 +1865,10 @@ class MoxTest(unittest.TestCase):
 
         self.mox.VerifyAll()
 
-        self.assertEquals(9, actual_one)
+        self.assertEqual(9, actual_one)
 
         # Repeated calls should return same number.
-        self.assertEquals(9, second_one)
+        self.assertEqual(9, second_one)
 
     def testMutlipleTimesUsingFunc(self):
         """Test that the Func is not evaluated more times than necessary.
@@ -1710,12 +1876,13 @@ class MoxTest(unittest.TestCase):
         If a Func() has side effects, it can cause a passing test to fail.
         """
 
-        self.counter = 0
+        # A one element list, since Python 2 closures cannot rebind names.
+        counter = [0]
 
         def MyFunc(actual_str):
             """Increment the counter if actual_str == 'foo'."""
             if actual_str == 'foo':
-                self.counter += 1
+                counter[0] += 1
             return True
 
         mock_obj = self.mox.CreateMockAnything()
@@ -1732,7 +1899,7 @@ class MoxTest(unittest.TestCase):
 
         self.mox.VerifyAll()
 
-        self.assertEquals(2, self.counter)
+        self.assertEqual(2, counter[0])
 
     def testMultipleTimesThreeMethods(self):
         """Test if MultipleTimesGroup works with three or more methods."""
@@ -1754,10 +1921,8 @@ class MoxTest(unittest.TestCase):
         actual_four = mock_obj.Method(4)
         mock_obj.Close()
 
-        self.assertEquals(9, actual_one)
-        self.assertEquals(8, actual_two)
-        self.assertEquals(7, actual_three)
-        self.assertEquals(10, actual_four)
+        self.assertEqual((9, 8, 7, 10),
+                         (actual_one, actual_two, actual_three, actual_four))
 
         self.mox.VerifyAll()
 
@@ -1779,7 +1944,8 @@ class MoxTest(unittest.TestCase):
         mock_obj.Method(3)
         mock_obj.Method(2)
 
-        self.assertRaises(mox.UnexpectedMethodCallError, mock_obj.Method, 4)
+        with self.assertRaises(mox.UnexpectedMethodCallError):
+            mock_obj.Method(4)
 
     def testMultipleTimesTwoGroups(self):
         """Test if MultipleTimesGroup works with a group after a
@@ -1799,8 +1965,8 @@ class MoxTest(unittest.TestCase):
         mock_obj.Method(3)
         mock_obj.Close()
 
-        self.assertEquals(9, actual_one)
-        self.assertEquals(42, actual_three)
+        self.assertEqual(9, actual_one)
+        self.assertEqual(42, actual_three)
 
         self.mox.VerifyAll()
 
@@ -1820,7 +1986,8 @@ class MoxTest(unittest.TestCase):
         mock_obj.Method(1)
         mock_obj.Method(3)
 
-        self.assertRaises(mox.UnexpectedMethodCallError, mock_obj.Method, 1)
+        with self.assertRaises(mox.UnexpectedMethodCallError):
+            mock_obj.Method(1)
 
     def testWithSideEffects(self):
         """Test side effect operations actually modify their target objects."""
@@ -1854,9 +2021,9 @@ class MoxTest(unittest.TestCase):
         self.mox.ReplayAll()
 
         local_list = ['original']
-        self.failUnlessRaises(Exception,
-                              mock_obj.ConfigureInOutParameter,
-                              local_list)
+        self.assertRaises(Exception,
+                          mock_obj.ConfigureInOutParameter,
+                          local_list)
         mock_obj.WorkWithParameter(local_list)
 
         self.mox.VerifyAll()
@@ -1877,105 +2044,96 @@ class MoxTest(unittest.TestCase):
 
         self.mox.VerifyAll()
         self.mox.UnsetStubs()
-        self.assertEquals('foo', actual)
+        self.assertEqual('foo', actual)
         self.assertTrue(type(test_obj.OtherValidCall) is method_type)
 
     def testStubOutMethod_Unbound_Comparator(self):
-        instance = TestClass()
         self.mox.StubOutWithMock(TestClass, 'OtherValidCall')
 
-        TestClass.OtherValidCall(mox.IgnoreArg()).AndReturn('foo')
+        TestClass.OtherValidCall(_IGNORE).AndReturn('foo')
         self.mox.ReplayAll()
 
-        actual = TestClass.OtherValidCall(instance)
+        actual = TestClass.OtherValidCall(_TEST_INSTANCE)
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
-        self.assertEquals('foo', actual)
+        self.assertEqual('foo', actual)
 
     def testStubOutMethod_Unbound_Subclass_Comparator(self):
         self.mox.StubOutWithMock(mox_test_helper.TestClassFromAnotherModule,
                                  'Value')
         mox_test_helper.TestClassFromAnotherModule.Value(
-            mox.IsA(mox_test_helper.ChildClassFromAnotherModule)
-        ).AndReturn('foo')
+            _ISA_CHILD).AndReturn('foo')
         self.mox.ReplayAll()
 
         instance = mox_test_helper.ChildClassFromAnotherModule()
         actual = mox_test_helper.TestClassFromAnotherModule.Value(instance)
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
-        self.assertEquals('foo', actual)
+        self.assertEqual('foo', actual)
 
     def testStubOuMethod_Unbound_WithOptionalParams(self):
         self.mox = mox.Mox()
         self.mox.StubOutWithMock(TestClass, 'OptionalArgs')
-        TestClass.OptionalArgs(mox.IgnoreArg(), foo=2)
+        TestClass.OptionalArgs(_IGNORE, foo=2)
         self.mox.ReplayAll()
 
         t = TestClass()
         TestClass.OptionalArgs(t, foo=2)
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
     def testStubOutMethod_Unbound_ActualInstance(self):
-        instance = TestClass()
         self.mox.StubOutWithMock(TestClass, 'OtherValidCall')
 
-        TestClass.OtherValidCall(instance).AndReturn('foo')
+        TestClass.OtherValidCall(_TEST_INSTANCE).AndReturn('foo')
         self.mox.ReplayAll()
 
-        actual = TestClass.OtherValidCall(instance)
+        actual = TestClass.OtherValidCall(_TEST_INSTANCE)
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
-        self.assertEquals('foo', actual)
+        self.assertEqual('foo', actual)
 
     def testStubOutMethod_Unbound_DifferentInstance(self):
-        instance = TestClass()
         self.mox.StubOutWithMock(TestClass, 'OtherValidCall')
 
-        TestClass.OtherValidCall(instance).AndReturn('foo')
+        TestClass.OtherValidCall(_TEST_INSTANCE).AndReturn('foo')
         self.mox.ReplayAll()
 
         # This should fail, since the instances are different
-        self.assertRaises(mox.UnexpectedMethodCallError,
-                          TestClass.OtherValidCall, "wrong self")
+        with self.assertRaises(mox.UnexpectedMethodCallError):
+            TestClass.OtherValidCall("wrong self")
 
-        self.assertRaises(mox.SwallowedExceptionError, self.mox.VerifyAll)
-        self.mox.UnsetStubs()
+        with self.assertRaises(mox.SwallowedExceptionError):
+            self.mox.VerifyAll()
 
     def testStubOutMethod_Unbound_NamedUsingPositional(self):
         """Check positional parameters can be matched to keyword arguments."""
         self.mox.StubOutWithMock(mox_test_helper.ExampleClass, 'NamedParams')
-        instance = mox_test_helper.ExampleClass()
-        mox_test_helper.ExampleClass.NamedParams(instance, 'foo', baz=None)
+        mox_test_helper.ExampleClass.NamedParams(
+            _EXAMPLE_INSTANCE, 'foo', baz=None)
         self.mox.ReplayAll()
 
-        mox_test_helper.ExampleClass.NamedParams(instance, 'foo', baz=None)
+        mox_test_helper.ExampleClass.NamedParams(
+            _EXAMPLE_INSTANCE, 'foo', baz=None)
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
     def testStubOutMethod_Unbound_NamedUsingPositional_SomePositional(self):
         """Check positional parameters can be matched to keyword arguments."""
         self.mox.StubOutWithMock(mox_test_helper.ExampleClass, 'TestMethod')
-        instance = mox_test_helper.ExampleClass()
-        mox_test_helper.ExampleClass.TestMethod(instance, 'one', 'two', 'nine')
+        mox_test_helper.ExampleClass.TestMethod(
+            _EXAMPLE_INSTANCE, 'one', 'two', 'nine')
         self.mox.ReplayAll()
 
-        mox_test_helper.ExampleClass.TestMethod(instance, 'one', 'two', 'nine')
+        mox_test_helper.ExampleClass.TestMethod(
+            _EXAMPLE_INSTANCE, 'one', 'two', 'nine')
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
     def testStubOutMethod_Unbound_SpecialArgs(self):
         self.mox.StubOutWithMock(mox_test_helper.ExampleClass, 'SpecialArgs')
-        instance = mox_test_helper.ExampleClass()
         mox_test_helper.ExampleClass.SpecialArgs(
-            instance,
+            _EXAMPLE_INSTANCE,
             'foo',
             None,
             bar='bar'
@@ -1983,26 +2141,24 @@ class MoxTest(unittest.TestCase):
         self.mox.ReplayAll()
 
         mox_test_helper.ExampleClass.SpecialArgs(
-            instance,
+            _EXAMPLE_INSTANCE,
             'foo',
             None,
             bar='bar'
         )
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
     def testStubOutMethod_Bound_SimpleTest(self):
         t = self.mox.CreateMock(TestClass)
 
-        t.MethodWithArgs(mox.IgnoreArg(), mox.IgnoreArg()).AndReturn('foo')
+        t.MethodWithArgs(_IGNORE, _IGNORE).AndReturn('foo')
         self.mox.ReplayAll()
 
         actual = t.MethodWithArgs(None, None)
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
-        self.assertEquals('foo', actual)
+        self.assertEqual('foo', actual)
 
     def testStubOutMethod_Bound_NamedUsingPositional(self):
         """Check positional parameters can be matched to keyword arguments."""
@@ -2014,7 +2170,6 @@ class MoxTest(unittest.TestCase):
         instance.NamedParams('foo', baz=None)
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
     def testStubOutMethod_Bound_NamedUsingPositional_SomePositional(self):
         """Check positional parameters can be matched to keyword arguments."""
@@ -2026,7 +2181,6 @@ class MoxTest(unittest.TestCase):
         instance.TestMethod(instance, 'one', 'two', 'nine')
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
     def testStubOutMethod_Bound_SpecialArgs(self):
         self.mox.StubOutWithMock(mox_test_helper.ExampleClass, 'SpecialArgs')
@@ -2037,7 +2191,6 @@ class MoxTest(unittest.TestCase):
         instance.SpecialArgs(instance, 'foo', None, bar='bar')
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
     def testStubOutMethod_Func_PropgatesExceptions(self):
         """Errors in a Func comparator should propagate to the calling
@@ -2052,20 +2205,18 @@ class MoxTest(unittest.TestCase):
             else:
                 raise TestException
 
+        is_one = mox.Func(raiseExceptionOnNotOne)
         test_obj = TestClass()
         self.mox.StubOutWithMock(test_obj, 'MethodWithArgs')
-        test_obj.MethodWithArgs(
-            mox.IgnoreArg(), mox.Func(raiseExceptionOnNotOne)).AndReturn(1)
-        test_obj.MethodWithArgs(
-            mox.IgnoreArg(), mox.Func(raiseExceptionOnNotOne)).AndReturn(1)
+        test_obj.MethodWithArgs(_IGNORE, is_one).AndReturn(1)
+        test_obj.MethodWithArgs(_IGNORE, is_one).AndReturn(1)
         self.mox.ReplayAll()
 
         self.assertEqual(test_obj.MethodWithArgs('ignored', 1), 1)
-        self.assertRaises(TestException,
-                          test_obj.MethodWithArgs, 'ignored', 2)
+        with self.assertRaises(TestException):
+            test_obj.MethodWithArgs('ignored', 2)
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
     def testStubout_Method_ExplicitContains_For_Set(self):
         """Test that explicit __contains__() for a set gets mocked with
@@ -2085,7 +2236,7 @@ class MoxTest(unittest.TestCase):
 
     def testStubOut_SignatureMatching_init_(self):
         self.mox.StubOutWithMock(mox_test_helper.ExampleClass, '__init__')
-        mox_test_helper.ExampleClass.__init__(mox.IgnoreArg())
+        mox_test_helper.ExampleClass.__init__(_IGNORE)
         self.mox.ReplayAll()
 
         # Create an instance of a child class, which calls the parent
@@ -2093,13 +2244,12 @@ class MoxTest(unittest.TestCase):
         mox_test_helper.ChildExampleClass()
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
     def testStubOutClass_OldStyle(self):
         """Test a mocked class whose __init__ returns a Mock."""
         self.mox.StubOutWithMock(mox_test_helper, 'TestClassFromAnotherModule')
-        self.assert_(isinstance(mox_test_helper.TestClassFromAnotherModule,
-                                mox.MockObject))
+        self.assertTrue(isinstance(
+            mox_test_helper.TestClassFromAnotherModule, mox.MockObject))
 
         mock_instance = self.mox.CreateMock(
             mox_test_helper.TestClassFromAnotherModule)
@@ -2112,8 +2262,7 @@ class MoxTest(unittest.TestCase):
         actual = a_mock.Value()
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
-        self.assertEquals('mock instance', actual)
+        self.assertEqual('mock instance', actual)
 
     def testStubOutClass(self):
         self.mox.StubOutClassWithMocks(mox_test_helper, 'CallableClass')
@@ -2135,15 +2284,12 @@ class MoxTest(unittest.TestCase):
         actual_two = two('one')
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
         # Verify the correct mocks were returned
-        self.assertEquals(mock_one, one)
-        self.assertEquals(mock_two, two)
+        self.assertEqual((mock_one, mock_two), (one, two))
 
         # Verify
-        self.assertEquals('mock', actual_one)
-        self.assertEquals('called mock', actual_two)
+        self.assertEqual(('mock', 'called mock'), (actual_one, actual_two))
 
     def testStubOutClassWithMetaClass(self):
         self.mox.StubOutClassWithMocks(
@@ -2158,59 +2304,49 @@ class MoxTest(unittest.TestCase):
         actual_one = one.Value()
 
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
         # Verify the correct mocks were returned
-        self.assertEquals(mock_one, one)
+        self.assertEqual(mock_one, one)
 
         # Verify
-        self.assertEquals('mock', actual_one)
-        self.assertEquals('meta', one.x)
-
-    try:
-        import abc
-        # I'd use the unittest skipping decorators for this but I want to
-        # support older versions of Python that don't have them.
-
-        def testStubOutClass_ABCMeta(self):
-            self.mox.StubOutClassWithMocks(mox_test_helper,
-                                           'CallableSubclassOfMyDictABC')
-            mock_foo = mox_test_helper.CallableSubclassOfMyDictABC(
-                foo='!mock bar'
-            )
-            mock_foo['foo'].AndReturn('mock bar')
-            mock_spam = mox_test_helper.CallableSubclassOfMyDictABC(
-                spam='!mock eggs'
-            )
-            mock_spam('beans').AndReturn('called mock')
+        self.assertEqual(('mock', 'meta'), (actual_one, one.x))
+
+    @unittest.skipIf(abc is None, 'no abc module')
+    def testStubOutClass_ABCMeta(self):
+        self.mox.StubOutClassWithMocks(mox_test_helper,
+                                       'CallableSubclassOfMyDictABC')
+        mock_foo = mox_test_helper.CallableSubclassOfMyDictABC(
+            foo='!mock bar'
+        )
+        mock_foo['foo'].AndReturn('mock bar')
+        mock_spam = mox_test_helper.CallableSubclassOfMyDictABC(
+            spam='!mock eggs'
+        )
+        mock_spam('beans').AndReturn('called mock')
 
-            self.mox.ReplayAll()
+        self.mox.ReplayAll()
 
-            foo = mox_test_helper.CallableSubclassOfMyDictABC(foo='!mock bar')
-            actual_foo_bar = foo['foo']
+        foo = mox_test_helper.CallableSubclassOfMyDictABC(foo='!mock bar')
+        actual_foo_bar = foo['foo']
 
-            spam = mox_test_helper.CallableSubclassOfMyDictABC(
-                spam='!mock eggs'
-            )
-            actual_spam = spam('beans')
+        spam = mox_test_helper.CallableSubclassOfMyDictABC(
+            spam='!mock eggs'
+        )
+        actual_spam = spam('beans')
 
-            self.mox.VerifyAll()
-            self.mox.UnsetStubs()
+        self.mox.VerifyAll()
 
-            # Verify the correct mocks were returned
-            self.assertEquals(mock_foo, foo)
-            self.assertEquals(mock_spam, spam)
+        # Verify the correct mocks were returned
+        self.assertEqual(mock_foo, foo)
+        self.assertEqual(mock_spam, spam)
 
-            # Verify
-            self.assertEquals('mock bar', actual_foo_bar)
-            self.assertEquals('called mock', actual_spam)
-    except ImportError:
-        print >> sys.stderr, "testStubOutClass_ABCMeta. ... " \
-                             "Skipped - no abc module"
+        # Verify
+        self.assertEqual('mock bar', actual_foo_bar)
+        self.assertEqual('called mock', actual_spam)
 
     def testStubOutClass_NotAClass(self):
-        self.assertRaises(TypeError, self.mox.StubOutClassWithMocks,
-                          mox_test_helper, 'MyTestFunction')
+        with self.assertRaises(TypeError):
+            self.mox.StubOutClassWithMocks(mox_test_helper, 'MyTestFunction')
 
     def testStubOutClassNotEnoughCreated(self):
         self.mox.StubOutClassWithMocks(mox_test_helper, 'CallableClass')
@@ -2221,15 +2357,14 @@ class MoxTest(unittest.TestCase):
         self.mox.ReplayAll()
         mox_test_helper.CallableClass(1, 2)
 
-        self.assertRaises(mox.ExpectedMockCreationError, self.mox.VerifyAll)
-        self.mox.UnsetStubs()
+        with self.assertRaises(mox.ExpectedMockCreationError):
+            self.mox.VerifyAll()
 
     def testStubOutClassWrongSignature(self):
         self.mox.StubOutClassWithMocks(mox_test_helper, 'CallableClass')
 
-        self.assertRaises(AttributeError, mox_test_helper.CallableClass)
-
-        self.mox.UnsetStubs()
+        with self.assertRaises(AttributeError):
+            mox_test_helper.CallableClass()
 
     def testStubOutClassWrongParameters(self):
         self.mox.StubOutClassWithMocks(mox_test_helper, 'CallableClass')
@@ -2238,9 +2373,8 @@ class MoxTest(unittest.TestCase):
 
         self.mox.ReplayAll()
 
-        self.assertRaises(mox.UnexpectedMethodCallError,
-                          mox_test_helper.CallableClass, 8, 9)
-        self.mox.UnsetStubs()
+        with self.assertRaises(mox.UnexpectedMethodCallError):
+            mox_test_helper.CallableClass(8, 9)
 
     def testStubOutClassTooManyCreated(self):
         self.mox.StubOutClassWithMocks(mox_test_helper, 'CallableClass')
@@ -2249,23 +2383,28 @@ class MoxTest(unittest.TestCase):
 
         self.mox.ReplayAll()
         mox_test_helper.CallableClass(1, 2)
-        self.assertRaises(mox.UnexpectedMockCreationError,
-                          mox_test_helper.CallableClass, 8, 9)
-
-        self.mox.UnsetStubs()
+        with self.assertRaises(mox.UnexpectedMockCreationError):
+            mox_test_helper.CallableClass(8, 9)
 
     def testWarnsUserIfMockingMock(self):
         """Test that user is warned if they try to stub out a MockAnything."""
         self.mox.StubOutWithMock(TestClass, 'MyStaticMethod')
-        self.assertRaises(TypeError, self.mox.StubOutWithMock, TestClass,
-                          'MyStaticMethod')
+        with self.assertRaises(TypeError):
+            self.mox.StubOutWithMock(TestClass, 'MyStaticMethod')
 
     def testStubOutFirstClassMethodVerifiesSignature(self):
         self.mox.StubOutWithMock(mox_test_helper, 'MyTestFunction')
 
         # Wrong number of arguments
-        self.assertRaises(AttributeError, mox_test_helper.MyTestFunction, 1)
-        self.mox.UnsetStubs()
+        with self.assertRaises(AttributeError):
+            mox_test_helper.MyTestFunction(1)
+
+    def testMockModuleWithStubbedOutFunction(self):
+        """Test that a mock standing in for a function is not inspected."""
+        self.mox.StubOutWithMock(mox_test_helper, 'MyTestFunction')
+        mock_module = self.mox.CreateMock(mox_test_helper)
+        mock_module.MyTestFunction(1, 2)
+        self.assertEqual([], mock_module._exceptions_thrown)
 
     def _testMethodSignatureVerification(self, stubClass):
         # If stubClass is true, the test is run against an a stubbed out class,
@@ -2282,14 +2421,17 @@ class MoxTest(unittest.TestCase):
                 mox_test_helper.ExampleClass,
                 "TestMethod"
             )
-        self.assertRaises(AttributeError, obj.TestMethod)
-        self.assertRaises(AttributeError, obj.TestMethod, 1)
-        self.assertRaises(AttributeError, obj.TestMethod, nine=2)
+        with self.assertRaises(AttributeError):
+            obj.TestMethod()
+        with self.assertRaises(AttributeError):
+            obj.TestMethod(1)
+        with self.assertRaises(AttributeError):
+            obj.TestMethod(nine=2)
         obj.TestMethod(1, 2)
         obj.TestMethod(1, 2, 3)
         obj.TestMethod(1, 2, nine=3)
-        self.assertRaises(AttributeError, obj.TestMethod, 1, 2, 3, 4)
-        self.mox.UnsetStubs()
+        with self.assertRaises(AttributeError):
+            obj.TestMethod(1, 2, 3, 4)
 
     def testStubOutClassMethodVerifiesSignature(self):
         self._testMethodSignatureVerification(stubClass=True)
@@ -2306,7 +2448,7 @@ class MoxTest(unittest.TestCase):
 
         foo = Foo()
         self.mox.StubOutWithMock(foo, "obj")
-        self.assert_(isinstance(foo.obj, mox.MockObject))
+        self.assertTrue(isinstance(foo.obj, mox.MockObject))
         foo.obj.ValidCall()
         self.mox.ReplayAll()
 
@@ -2314,7 +2456,41 @@ class MoxTest(unittest.TestCase):
 
         self.mox.VerifyAll()
         self.mox.UnsetStubs()
-        self.failIf(isinstance(foo.obj, mox.MockObject))
+        self.assertFalse(isinstance(foo.obj, mox.MockObject))
+
+    def testStubOutWithMocks(self):
+        """Test that each named attribute is replaced with a Mock."""
+        foo = TestClass()
+        self.mox.StubOutWithMocks(foo, ['ValidCall', 'OtherValidCall'])
+        self.assertTrue(isinstance(foo.ValidCall, mox.MockObject))
+        self.assertTrue(isinstance(foo.OtherValidCall, mox.MockObject))
+        foo.ValidCall()
+        foo.OtherValidCall()
+        self.mox.ReplayAll()
+
+        foo.ValidCall()
+        foo.OtherValidCall()
+
+        self.mox.VerifyAll()
+        self.mox.UnsetStubs()
+        self.assertFalse(isinstance(foo.ValidCall, mox.MockObject))
+        self.assertFalse(isinstance(foo.OtherValidCall, mox.MockObject))
+
+    def testStubOutWithMocksChecksAllNamesFirst(self):
+        """Test that nothing is stubbed if one of the names is a mock."""
+        self.mox.StubOutWithMock(TestClass, 'MyStaticMethod')
+        valid_call = TestClass.ValidCall
+        with self.assertRaises(TypeError):
+            self.mox.StubOutWithMocks(TestClass,
+                                      ['ValidCall', 'MyStaticMethod'])
+        self.assertEqual(valid_call, TestClass.ValidCall)
+
+    def testStubOutWithMocksRejectsRepeatedNames(self):
+        """Test that nothing is stubbed if a name is given twice."""
+        valid_call = TestClass.ValidCall
+        with self.assertRaises(ValueError):
+            self.mox.StubOutWithMocks(TestClass, ['ValidCall', 'ValidCall'])
+        self.assertEqual(valid_call, TestClass.ValidCall)
 
     def testStubOutReWorks(self):
         self.mox.StubOutWithMock(re, 'search')
@@ -2324,7 +2500,6 @@ class MoxTest(unittest.TestCase):
         self.mox.ReplayAll()
         result = TestClass().reSearch()
         self.mox.VerifyAll()
-        self.mox.UnsetStubs()
 
         self.assertEqual(result, 'true')
 
@@ -2339,9 +2514,9 @@ class MoxTest(unittest.TestCase):
         try:
             foo.GetBar().ShowMeTheMoney()
         except AttributeError as e:
-            self.assertEquals('MockMethod has no attribute "ShowMeTheMoney". '
-                              'Did you remember to put your mocks in replay '
-                              'mode?', str(e))
+            self.assertEqual('MockMethod has no attribute "ShowMeTheMoney". '
+                             'Did you remember to put your mocks in replay '
+                             'mode?', str(e))
 
     def testSwallowedUnknownMethodCall(self):
         """Test that a swallowed UnknownMethodCallError will be re-raised."""
@@ -2357,7 +2532,8 @@ class MoxTest(unittest.TestCase):
         # UnknownMethodCallError swallowed
         call()
 
-        self.assertRaises(mox.SwallowedExceptionError, self.mox.VerifyAll)
+        with self.assertRaises(mox.SwallowedExceptionError):
+            self.mox.VerifyAll()
 
     def testSwallowedUnexpectedMockCreation(self):
         """Test that a swallowed UnexpectedMockCreationError will be
@@ -2374,8 +2550,8 @@ class MoxTest(unittest.TestCase):
         # UnexpectedMockCreationError swallowed
         call()
 
-        self.assertRaises(mox.SwallowedExceptionError, self.mox.VerifyAll)
-        self.mox.UnsetStubs()
+        with self.assertRaises(mox.SwallowedExceptionError):
+            self.mox.VerifyAll()
 
     def testSwallowedUnexpectedMethodCall_WrongMethod(self):
         """Test that a swallowed UnexpectedMethodCallError will be re-raised.
@@ -2395,7 +2571,8 @@ class MoxTest(unittest.TestCase):
         # UnexpectedMethodCall swallowed
         call()
 
-        self.assertRaises(mox.SwallowedExceptionError, self.mox.VerifyAll)
+        with self.assertRaises(mox.SwallowedExceptionError):
+            self.mox.VerifyAll()
 
     def testSwallowedUnexpectedMethodCall_WrongArguments(self):
         """Test that a swallowed UnexpectedMethodCallError will be re-raised.
@@ -2414,7 +2591,8 @@ class MoxTest(unittest.TestCase):
         # UnexpectedMethodCall swallowed
         call()
 
-        self.assertRaises(mox.SwallowedExceptionError, self.mox.VerifyAll)
+        with self.assertRaises(mox.SwallowedExceptionError):
+            self.mox.VerifyAll()
 
     def testSwallowedUnexpectedMethodCall_UnorderedGroup(self):
         """Test that a swallowed UnexpectedMethodCallError will be re-raised.
@@ -2435,7 +2613,8 @@ class MoxTest(unittest.TestCase):
         # UnexpectedMethodCall swallowed
         call()
 
-        self.assertRaises(mox.SwallowedExceptionError, self.mox.VerifyAll)
+        with self.assertRaises(mox.SwallowedExceptionError):
+            self.mox.VerifyAll()
 
     def testSwallowedUnexpectedMethodCall_MultipleTimesGroup(self):
         """Test that a swallowed UnexpectedMethodCallError will be re-raised.
@@ -2454,7 +2633,8 @@ class MoxTest(unittest.TestCase):
         # UnexpectedMethodCall swallowed
         call()
 
-        self.assertRaises(mox.SwallowedExceptionError, self.mox.VerifyAll)
+        with self.assertRaises(mox.SwallowedExceptionError):
+            self.mox.VerifyAll()
 
 
 class ReplayTest(unittest.TestCase):
@@ -2504,10 +2684,9 @@ class MoxTestBaseTest(unittest.TestCase):
 
     def _VerifySuccess(self):
         """Run the checks to confirm test method completed successfully."""
-        self.mox.StubOutWithMock(self.test_mox, 'UnsetStubs')
-        self.mox.StubOutWithMock(self.test_mox, 'VerifyAll')
-        self.mox.StubOutWithMock(self.test_stubs, 'UnsetAll')
-        self.mox.StubOutWithMock(self.test_stubs, 'SmartUnsetAll')
+        self.mox.StubOutWithMocks(self.test_mox, ['UnsetStubs', 'VerifyAll'])
+        self.mox.StubOutWithMocks(self.test_stubs,
+                                  ['UnsetAll', 'SmartUnsetAll'])
         self.test_mox.UnsetStubs()
         self.test_mox.VerifyAll()
         self.test_stubs.UnsetAll()
@@ -2528,9 +2707,10 @@ class MoxTestBaseTest(unittest.TestCase):
         """Let testSuccess() unset all the mocks, and verify they've been
         unset."""
         self._CreateTest('testSuccess')
+        os_listdir = mox_test_helper.os.listdir
         self.test.run(result=self.result)
         self.assertTrue(self.result.wasSuccessful())
-        self.assertEqual(OS_LISTDIR, mox_test_helper.os.listdir)
+        self.assertEqual(os_listdir, mox_test_helper.os.listdir)
 
     def testStubs(self):
         """Test that "self.stubs" is provided as is useful."""
@@ -2544,38 +2724,40 @@ class MoxTestBaseTest(unittest.TestCase):
     def testStubsNoMocks(self):
         """Let testHasStubs() unset the stubs by itself."""
         self._CreateTest('testHasStubs')
+        os_listdir = mox_test_helper.os.listdir
         self.test.run(result=self.result)
         self.assertTrue(self.result.wasSuccessful())
-        self.assertEqual(OS_LISTDIR, mox_test_helper.os.listdir)
+        self.assertEqual(os_listdir, mox_test_helper.os.listdir)
 
     def testExpectedNotCalled(self):
         """Stubbed out method is not called."""
         self._CreateTest('testExpectedNotCalled')
         self.mox.StubOutWithMock(self.test_mox, 'UnsetStubs')
-        self.mox.StubOutWithMock(self.test_stubs, 'UnsetAll')
-        self.mox.StubOutWithMock(self.test_stubs, 'SmartUnsetAll')
+        self.mox.StubOutWithMocks(self.test_stubs,
+                                  ['UnsetAll', 'SmartUnsetAll'])
         # Don't stub out VerifyAll - that's what causes the test to fail
         self.test_mox.UnsetStubs()
         self.test_stubs.UnsetAll()
         self.test_stubs.SmartUnsetAll()
         self.mox.ReplayAll()
         self.test.run(result=self.result)
-        self.failIf(self.result.wasSuccessful())
+        self.assertFalse(self.result.wasSuccessful())
         self.mox.VerifyAll()
 
     def testExpectedNotCalledNoMocks(self):
         """Let testExpectedNotCalled() unset all the mocks by itself."""
         self._CreateTest('testExpectedNotCalled')
+        os_listdir = mox_test_helper.os.listdir
         self.test.run(result=self.result)
-        self.failIf(self.result.wasSuccessful())
-        self.assertEqual(OS_LISTDIR, mox_test_helper.os.listdir)
+        self.assertFalse(self.result.wasSuccessful())
+        self.assertEqual(os_listdir, mox_test_helper.os.listdir)
 
     def testUnexpectedCall(self):
         """Stubbed out method is called with unexpected arguments."""
         self._CreateTest('testUnexpectedCall')
         self.mox.StubOutWithMock(self.test_mox, 'UnsetStubs')
-        self.mox.StubOutWithMock(self.test_stubs, 'UnsetAll')
-        self.mox.StubOutWithMock(self.test_stubs, 'SmartUnsetAll')
+        self.mox.StubOutWithMocks(self.test_stubs,
+                                  ['UnsetAll', 'SmartUnsetAll'])
         # Ensure no calls are made to VerifyAll()
         self.mox.StubOutWithMock(self.test_mox, 'VerifyAll')
         self.test_mox.UnsetStubs()
@@ -2583,15 +2765,15 @@ class MoxTestBaseTest(unittest.TestCase):
         self.test_stubs.SmartUnsetAll()
         self.mox.ReplayAll()
         self.test.run(result=self.result)
-        self.failIf(self.result.wasSuccessful())
+        self.assertFalse(self.result.wasSuccessful())
         self.mox.VerifyAll()
 
     def testFailure(self):
         """Failing assertion in test method."""
         self._CreateTest('testFailure')
         self.mox.StubOutWithMock(self.test_mox, 'UnsetStubs')
-        self.mox.StubOutWithMock(self.test_stubs, 'UnsetAll')
-        self.mox.StubOutWithMock(self.test_stubs, 'SmartUnsetAll')
+        self.mox.StubOutWithMocks(self.test_stubs,
+                                  ['UnsetAll', 'SmartUnsetAll'])
         # Ensure no calls are made to VerifyAll()
         self.mox.StubOutWithMock(self.test_mox, 'VerifyAll')
         self.test_mox.UnsetStubs()
@@ -2599,7 +2781,7 @@ class MoxTestBaseTest(unittest.TestCase):
         self.test_stubs.SmartUnsetAll()
         self.mox.ReplayAll()
         self.test.run(result=self.result)
-        self.failIf(self.result.wasSuccessful())
+        self.assertFalse(self.result.wasSuccessful())
         self.mox.VerifyAll()
 
     def testMixin(self):
@@ -2641,11 +2823,11 @@ class ResetTest(unittest.TestCase):
         self.assertFalse(mock_obj._replay_mode)
         mock_obj._Replay()
         self.assertTrue(mock_obj._replay_mode)
-        self.assertEquals(1, len(mock_obj._expected_calls_queue))
+        self.assertEqual(1, len(mock_obj._expected_calls_queue))
 
         mox.Reset(mock_obj)
         self.assertFalse(mock_obj._replay_mode)
-        self.assertEquals(0, len(mock_obj._expected_calls_queue))
+        self.assertEqual(0, len(mock_obj._expected_calls_queue))
 
 
 class MyTestCase(unittest.TestCase):
@@ -2658,7 +2840,7 @@ class MyTestCase(unittest.TestCase):
 
     def testMethodOverride(self):
         """Should be properly overriden in a derived class."""
-        self.assertEquals(42, self.another_critical_variable)
+        self.assertEqual(42, self.another_critical_variable)
         self.another_critical_variable += 1
 
 
@@ -2671,15 +2853,15 @@ class MoxTestBaseMultipleInheritanceTest(mox.MoxTestBase, MyTestCase):
 
     def testMultipleInheritance(self):
         """Should be able to access members created by all parent setUp()."""
-        self.assert_(isinstance(self.mox, mox.Mox))
-        self.assertEquals(42, self.critical_variable)
+        self.assertTrue(isinstance(self.mox, mox.Mox))
+        self.assertEqual(42, self.critical_variable)
 
     def testMethodOverride(self):
         """Should run before MyTestCase.testMethodOverride."""
-        self.assertEquals(99, self.another_critical_variable)
+        self.assertEqual(99, self.another_critical_variable)
         self.another_critical_variable = 42
         super(MoxTestBaseMultipleInheritanceTest, self).testMethodOverride()
-        self.assertEquals(43, self.another_critical_variable)
+        self.assertEqual(43, self.another_critical_variable)
 
 
 class MoxTestDontMockProperties(MoxTestBaseTest):
@@ -2705,7 +2887,7 @@ class TestClass:
         return self.__ivar == rhs
 
     def __ne__(self, rhs):
-        return not self.__eq__(rhs)
+        return self.__ivar != rhs
 
     def ValidCall(self):
         pass
@@ -2758,6 +2940,10 @@ class TestClass:
         return re.search('a', 'ivan')
 
 
+# Shared like _EXAMPLE_INSTANCE; it can only be built once TestClass exists.
+_TEST_INSTANCE = TestClass()
+
+
 class ChildClass(TestClass):
     """This inherits from TestClass."""
 
@@ -2788,6 +2974,15 @@ class ClassWithProperties(object):
     prop_attr = property(getter_attr, setter_attr)
 
 
+class ClassWithKeyAttribute(object):
+    """Object with a single class attribute, used by
+    ContainsAttributeValueTest."""
+
+    __slots__ = ()
+
+    key = 1
+
+
 class SubscribtableNonIterableClass(object):
     def __getitem__(self, index):
         raise IndexError
@@ -1,9 +1,16 @@
+import os
+import re
+
 try:
     from setuptools import setup
 except ImportError:
     from distutils.core import setup
 
-from __version__ import __version__
+with open(os.path.join(os.path.dirname(__file__), '__version__.py')) as f:
+    version_match = re.search(r'__version__\s*=\s*["\']([^"\']+)', f.read())
+if version_match is None:
+    raise RuntimeError('Unable to find __version__ in __version__.py')
+__version__ = version_match.group(1)
 
 classifiers = """
 Environment :: Console
@@ -18,8 +25,6 @@ Topic :: Software Development :: Quality Assurance
 Topic :: Software Development :: Testing
 """
 
-classifier_list = [c for c in classifiers.split("\n") if c]
-
 setup(name='pymox',
       version=__version__,
       py_modules=['mox', 'stubout', '__version__'],
@@ -28,7 +33,7 @@ setup(name='pymox',
       maintainer_email='mox-discuss@googlegroups.com',
       license='Apache License, Version 2.0',
       description='Mock object framework',
-      classifiers=classifier_list,
+      classifiers=[c for c in classifiers.splitlines() if c],
       include_package_data=True,
       install_requires=['six'],
       long_description='''Pymox is an open source mock object framework for Python.